@@ -0,0 +1,135 @@
+import os, random, time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from game_emulation import Game_grid
+from minesweeper_solver import Solver, solve
+from bitboard_solver import Bitboard_solver
+from solver_metrics import Solver_metrics
+
+# (board size, bomb count) presets, named the way main.py sets them up
+PRESETS = {
+    "18x60": (18, 60),
+    "25x140": (25, 140),
+}
+
+# solver backends, by the name benchmark.py takes on the command line
+BACKENDS = {
+    "bytearray": Solver,
+    "bitboard": Bitboard_solver,
+}
+
+
+class Game_record:
+    def __init__(self, size, bombs, seed, won, lost, num_actions, solve_time, metrics) -> None:
+        self.size = size
+        self.bombs = bombs
+        self.seed = seed
+        self.won = won
+        self.lost = lost
+        self.num_actions = num_actions
+        self.solve_time = solve_time
+        self.metrics = metrics
+
+
+"""
+Derive the seed of one game in a batch.
+
+Each game gets its own seed so a batch can be replayed or split up in any order.
+"""
+def game_seed(base_seed, game_index):
+    return (base_seed << 32) | game_index
+
+
+"""
+Play one complete game with a seeded board, from the opening click to the end of the solver's run.
+
+Returns a Game_record.
+"""
+def play_game(size, bombs, seed, backend="bytearray", pool=None) -> Game_record:
+    game_grid = Game_grid(size, bombs, rng=random.Random(seed))
+    metrics = Solver_metrics()
+    start = time.perf_counter()
+    result = solve(game_grid, metrics=metrics, solver_class=BACKENDS[backend], pool=pool)
+    solve_time = time.perf_counter() - start
+    return Game_record(size, bombs, seed, result.won, result.lost, len(result.actions), solve_time, metrics)
+
+
+def run_games(size, bombs, num_games, base_seed=0, backend="bytearray", pool=None):
+    for game_index in range(num_games):
+        yield play_game(size, bombs, game_seed(base_seed, game_index), backend, pool)
+
+
+def play_games(size, bombs, seeds, backend="bytearray") -> list[Game_record]:
+    return [play_game(size, bombs, seed, backend) for seed in seeds]
+
+
+"""
+Call function(*args) for each args tuple of tasks on a pool of `workers` processes, yielding the items
+of each returned list as its task finishes, in no particular order.
+
+Only 4 tasks per worker are in flight at once, so a very large batch doesn't queue every task up front;
+tasks is consumed lazily and can be a generator.
+"""
+def run_bounded(function, tasks, workers):
+    max_in_flight = 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for args in tasks:
+            pending.add(pool.submit(function, *args))
+            if len(pending) < max_in_flight: continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+        for future in as_completed(pending):
+            yield from future.result()
+
+
+"""
+Play games across a process pool, one chunk of seeds per task.
+
+Every worker builds its own Game_grid and Solver. Records are yielded as their chunk finishes,
+so the order is not the seed order. Only a bounded number of chunks is in flight at once so that
+very large batches don't queue every task up front.
+"""
+def run_games_parallel(size, bombs, num_games, base_seed=0, workers=None, chunk_size=8, backend="bytearray"):
+    chunks = (
+        [game_seed(base_seed, game_index) for game_index in range(first, min(first + chunk_size, num_games))]
+        for first in range(0, num_games, chunk_size)
+    )
+    workers = workers or os.cpu_count() or 1
+    yield from run_bounded(play_games, ((size, bombs, seeds, backend) for seeds in chunks), workers)
+
+
+class Batch_stats:
+    def __init__(self) -> None:
+        self.games = 0
+        self.wins = 0
+        self.losses = 0
+        self.solve_times = []
+        self.metrics = Solver_metrics()
+
+    def add(self, record:Game_record):
+        self.games += 1
+        self.wins += record.won
+        self.losses += record.lost
+        self.solve_times.append(record.solve_time)
+        self.metrics.merge(record.metrics)
+
+    def merge(self, other:"Batch_stats"):
+        self.games += other.games
+        self.wins += other.wins
+        self.losses += other.losses
+        self.solve_times.extend(other.solve_times)
+        self.metrics.merge(other.metrics)
+
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    def summary(self, wall_time):
+        return {
+            "games": self.games,
+            "win_rate": self.win_rate(),
+            "loss_rate": self.losses / self.games if self.games else 0.0,
+            "games_per_sec": self.games / wall_time if wall_time else 0.0,
+            "mean_solve_time": sum(self.solve_times) / self.games if self.games else 0.0,
+            "solver": self.metrics.report(),
+        }
@@ -0,0 +1,89 @@
+import argparse, json, random, time
+from concurrent.futures import ProcessPoolExecutor
+from game_emulation import Game_grid
+from pattern_cache import shared_cache
+from batch_runner import BACKENDS, PRESETS, Batch_stats, run_games, run_games_parallel
+
+
+def print_summary(name, summary):
+    print(f"{name}: {summary['games']} games, win rate {summary['win_rate']:.1%}, "
+          f"{summary['games_per_sec']:.2f} games/sec, {summary['mean_solve_time'] * 1000:.1f} ms solver time/game")
+    print("    " + ", ".join(f"{name} {count}" for name, count in summary["solver"]["counters"].items()))
+    for tier, stats in summary["solver"]["timings"].items():
+        print(f"    {tier:<20} calls {stats['calls']:>7}   p50 {stats['p50'] * 1000:8.3f} ms   p99 {stats['p99'] * 1000:8.3f} ms")
+
+
+"""
+Time building, seeding and opening one large board.
+The opening click is in the middle, so at low densities it flood fills a big region.
+
+Returns a dict of seconds per step and the number of cells the opening click revealed.
+"""
+def time_large_board(size, density, seed=0):
+    bombs = int(size * size * density)
+    start = time.perf_counter()
+    game_grid = Game_grid(size, bombs, rng=random.Random(seed))
+    built = time.perf_counter()
+    game_grid.start_game(size // 2, size // 2)
+    game_grid.game_started = True
+    placed = time.perf_counter()
+    game_grid.uncover_tile(size // 2, size // 2)
+    opened = time.perf_counter()
+    return {
+        "size": size,
+        "bombs": bombs,
+        "build": built - start,
+        "place_bombs": placed - built,
+        "flood_fill": opened - placed,
+        "revealed": game_grid.covered.count(0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play seeded games with the headless solver and report win rate and speed.")
+    parser.add_argument("--games", type=int, default=100, help="games to play per preset")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; game i of a preset uses a seed derived from it")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes; 0 uses every core")
+    parser.add_argument("--preset", action="append", choices=sorted(PRESETS), help="preset to run (default: all)")
+    parser.add_argument("--json", help="write the full report for every preset to this file")
+    parser.add_argument("--search-workers", type=int, default=0, help="with --workers 1, processes to run the guaranteed-action simulations of stuck positions on")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="bytearray", help="solver backend to play with")
+    parser.add_argument("--board-size", type=int, action="append", help="time generating and opening a board of this size instead of playing presets")
+    parser.add_argument("--density", type=float, default=0.1, help="bomb density for --board-size")
+    args = parser.parse_args()
+
+    reports = {}
+    if args.board_size:
+        for size in args.board_size:
+            report = time_large_board(size, args.density, args.seed)
+            reports[f"{size}x{size}"] = report
+            print(f"{size}x{size}, {report['bombs']} bombs: build {report['build']:.2f} s, place bombs {report['place_bombs']:.2f} s, "
+                  f"flood fill {report['flood_fill']:.2f} s ({report['revealed']} cells revealed)")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(reports, f, indent=2)
+        return
+    search_pool = ProcessPoolExecutor(args.search_workers) if args.search_workers and args.workers == 1 else None
+    for name in args.preset or sorted(PRESETS):
+        size, bombs = PRESETS[name]
+        stats = Batch_stats()
+        start = time.perf_counter()
+        if args.workers == 1:
+            records = run_games(size, bombs, args.games, args.seed, args.backend, search_pool)
+        else:
+            records = run_games_parallel(size, bombs, args.games, args.seed, workers=args.workers or None, backend=args.backend)
+        for record in records:
+            stats.add(record)
+        reports[name] = stats.summary(time.perf_counter() - start)
+        print_summary(name, reports[name])
+    if search_pool is not None: search_pool.shutdown()
+    if args.workers == 1:
+        reports["pattern_cache"] = shared_cache.stats()
+        print(f"pattern cache: {reports['pattern_cache']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
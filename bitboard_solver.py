@@ -0,0 +1,156 @@
+from game_emulation import State
+from minesweeper_solver import Solver
+
+# solver state to the ASCII digit of its bit in the covered or flagged mask
+_COVERED_DIGIT = b"".join(b"1" if state == State.COVERED else b"0" for state in range(256))
+_FLAGGED_DIGIT = b"".join(b"1" if state == State.FLAGGED else b"0" for state in range(256))
+
+
+"""One bit per cell id, set where solver_grid holds state, read in one pass as a binary number."""
+def state_mask(solver_grid, digits) -> int:
+    return int(solver_grid.translate(digits)[::-1], 2)
+
+
+class Neighbor_masks:
+    """
+    The neighbors of every cell as a bit mask, made when asked for from the board's Neighbor_table.
+
+    Each of the table's nine cell kinds has a 3 x 3 stencil of bits, anchored at the cell up and to the left
+    of its center; a cell's mask is its kind's stencil shifted to the cell. Only the stencils are stored, so
+    memory does not grow with the board.
+    """
+    def __init__(self, table) -> None:
+        self.kinds = table.kinds
+        # the bit of cell c sits at c + offset in a stencil anchored at cell 0
+        self.offset = table.size + 1
+        self.stencils = tuple(sum(1 << delta + self.offset for delta in deltas) for deltas in table.deltas)
+
+    def __getitem__(self, cell):
+        shift = cell - self.offset
+        stencil = self.stencils[self.kinds[cell]]
+        # a cell on the first row has nothing above it, so no stencil bit is shifted out
+        return stencil << shift if shift >= 0 else stencil >> -shift
+
+
+def cells_of(mask) -> list[int]:
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
+
+
+class Mask_counts:
+    """Read-only stand-in for Solver.covered_counts / flagged_counts, counting a mask's bits around a cell."""
+    def __init__(self, solver, mask_name) -> None:
+        self.solver = solver
+        self.mask_name = mask_name
+
+    def __getitem__(self, cell):
+        return (self.solver.masks[cell] & getattr(self.solver, self.mask_name)).bit_count()
+
+
+class Bitboard_solver(Solver):
+    """
+    Solver backend that keeps the covered and flagged cells of its grid as two Python integers,
+    one bit per cell id, with the neighbors of a cell as a mask of the same layout (see Neighbor_masks).
+
+    Neighbor counts are AND-and-popcount, and a simulation saves and restores its whole state as two
+    integers instead of recording a trail on the grid. self.tiles is still kept up to date outside of
+    simulations, for the tiers that build constraints from it and for observers.
+    """
+    def count_neighbor_states(self):
+        self.masks = Neighbor_masks(self.game_grid.neighbor_table)
+        self.covered_mask = state_mask(self.tiles, _COVERED_DIGIT)
+        self.flagged_mask = state_mask(self.tiles, _FLAGGED_DIGIT)
+        return Mask_counts(self, "covered_mask"), Mask_counts(self, "flagged_mask")
+
+    def set_tile(self, cell, state):
+        self.tiles[cell] = state
+        bit = 1 << cell
+        if state == State.COVERED: self.covered_mask |= bit
+        else: self.covered_mask &= ~bit
+        if state == State.FLAGGED: self.flagged_mask |= bit
+        else: self.flagged_mask &= ~bit
+
+    def update_frontier(self, changed_cells):
+        masks = self.masks
+        covered_mask = self.covered_mask
+        for cell in self.constraint_neighbors(changed_cells):
+            if masks[cell] & covered_mask:
+                self.frontier.add(cell)
+                self.dirty.add(cell)
+            else:
+                self.frontier.discard(cell)
+                self.dirty.discard(cell)
+
+    """
+    Same as Solver.search_for_determinism, reading the masks rather than solver_grid,
+    so that it also sees the state of a running simulation.
+    """
+    def search_for_determinism(self, solver_grid, cells=None, render = False):
+        actions = []
+        masks = self.masks
+        covered_mask = self.covered_mask
+        flagged_mask = self.flagged_mask
+        adjacent_bombs = self.adjacent_bombs
+        for index in (sorted(self.frontier) if cells is None else cells):
+            covered_neighbors = masks[index] & covered_mask
+            if not covered_neighbors: continue
+            num_covered = covered_neighbors.bit_count()
+            num_flagged = (masks[index] & flagged_mask).bit_count()
+
+            if num_covered + num_flagged == adjacent_bombs[index]:
+                action = State.FLAGGED
+            elif num_flagged == adjacent_bombs[index]:
+                action = State.REVEALED
+            else: continue
+            actions.append((index, [(action, neighbor) for neighbor in cells_of(covered_neighbors)]))
+        return actions
+
+    def find_unsat_cell(self, solver_grid, cells=None):
+        masks = self.masks
+        covered_mask = self.covered_mask
+        flagged_mask = self.flagged_mask
+        for index in (self.frontier if cells is None else cells):
+            adjacent_bombs = self.adjacent_bombs[index]
+            num_flagged = (masks[index] & flagged_mask).bit_count()
+            if num_flagged > adjacent_bombs:
+                return index
+            if num_flagged < adjacent_bombs and not masks[index] & covered_mask:
+                return index
+        return None
+
+    """
+    Same as Solver.run_simulation, on the masks only: the state before the simulation is two integers,
+    put back when it ends, and self.tiles is never touched.
+    """
+    def run_simulation(self, solver_grid, combination, render = False):
+        saved = (self.covered_mask, self.flagged_mask)
+        try:
+            flags = sum(1 << neighbor for neighbor in combination)
+            self.covered_mask &= ~flags
+            self.flagged_mask |= flags
+            actions = [(State.FLAGGED, neighbor) for neighbor in combination]
+
+            worklist = self.constraint_neighbors(combination)
+            if not self.is_sat(solver_grid, worklist): return "unsat"
+
+            while True:
+                new_actions = self.search_for_determinism(solver_grid, worklist)
+                if not new_actions: break
+                new_actions = [(action, cell) for _, tile_actions in new_actions for action, cell in tile_actions]
+
+                for action, acted_on_cell in new_actions:
+                    bit = 1 << acted_on_cell
+                    self.covered_mask &= ~bit
+                    if action == State.FLAGGED: self.flagged_mask |= bit
+                    else: self.flagged_mask &= ~bit
+                worklist = self.constraint_neighbors([cell for _, cell in new_actions])
+                if not self.is_sat(solver_grid, worklist):
+                    return "unsat"
+                actions += new_actions
+            return actions
+        finally:
+            self.covered_mask, self.flagged_mask = saved
@@ -0,0 +1,144 @@
+import argparse, os, random, time
+from game_emulation import Game_grid, State
+from minesweeper_solver import Solver
+from batch_runner import BACKENDS, PRESETS, game_seed, run_bounded
+from position_log import Position, Position_log_writer
+
+# kept out of logs/, where regression.py would replay every board as a failure
+NO_GUESS_LOG = os.path.join("boards", "no_guess.mslog")
+# covered byte to 1 for a revealed cell
+_IS_UNCOVERED = bytes([1]) + bytes(255)
+
+
+class Generated_board:
+    def __init__(self, seed, position, layouts, repairs, solve_time) -> None:
+        self.seed = seed
+        # the board with every cell covered and last_tile set to the opening click, or None if it gave up
+        self.position = position
+        # mine layouts drawn, and mines moved while repairing them
+        self.layouts = layouts
+        self.repairs = repairs
+        self.solve_time = solve_time
+
+
+"""
+Play a mine layout from the opening click with the solver's certain tiers only (no guessing).
+Returns the finished Game_grid and Solver.
+"""
+def play_without_guessing(position:Position, solver_class=Solver):
+    game_grid = Game_grid(position.size, position.bombs, load=position)
+    game_grid.uncover_tile(*position.last_tile)
+    solver = solver_class(game_grid)
+    solver.launch(game_grid, guess=False)
+    return game_grid, solver
+
+
+"""
+Move one mine so that the next solve can get further than the last one got stuck.
+
+Only trades between the cells the solver could not decide next to its revealed area and the interior
+(covered cells out of sight of every revealed number), so the numbers the solver was stuck on change
+and nothing else it has seen does. A mine is moved off a stuck cell into the interior when there is one
+to move, otherwise an interior mine is moved onto a stuck cell. Mines never move into the cells around
+the opening click.
+Returns False if no trade is possible, meaning the layout should be rejected.
+"""
+def repair_layout(has_bomb, game_grid, solver, keep_clear, rng):
+    revealed_around = game_grid.neighbor_table.count_around(game_grid.covered.translate(_IS_UNCOVERED))
+    stuck = []
+    interior = []
+    for cell, state in enumerate(solver.tiles):
+        if state != State.COVERED or cell in keep_clear: continue
+        if revealed_around[cell]: stuck.append(cell)
+        else: interior.append(cell)
+    for has_mine in (1, 0):
+        cells = [cell for cell in stuck if has_bomb[cell] == has_mine]
+        others = [other for other in interior if has_bomb[other] != has_mine]
+        if cells and others: break
+    else:
+        return False
+    cell = rng.choice(cells)
+    other = rng.choice(others)
+    has_bomb[cell], has_bomb[other] = has_bomb[other], has_bomb[cell]
+    return True
+
+
+"""
+Generate one board that the solver finishes from the opening click without guessing.
+
+Every repair replays the layout from the opening click, since moving a mine changes numbers that earlier
+deductions may have used. A layout still stuck after max_repairs is rejected and a new one drawn, up to
+max_layouts times.
+Returns a Generated_board, whose position is None if every layout was rejected.
+"""
+def generate_board(size, bombs, seed, start=None, max_repairs=None, max_layouts=100, solver_class=Solver) -> Generated_board:
+    rng = random.Random(seed)
+    row, col = start if start is not None else (size // 2, size // 2)
+    if max_repairs is None: max_repairs = bombs
+    num_cells = size * size
+    start_time = time.perf_counter()
+    total_repairs = 0
+    for layout in range(1, max_layouts + 1):
+        game_grid = Game_grid(size, bombs, rng=rng)
+        game_grid.start_game(row, col)
+        keep_clear = {row * size + col, *game_grid.neighbors[row * size + col]}
+        position = Position(size, bombs, bytearray(b"\x01") * num_cells, game_grid.has_bomb, bytearray(num_cells), (row, col))
+        for _ in range(max_repairs + 1):
+            game_grid, solver = play_without_guessing(position, solver_class)
+            if game_grid.won():
+                return Generated_board(seed, position, layout, total_repairs, time.perf_counter() - start_time)
+            if game_grid.lost() or not repair_layout(position.has_bomb, game_grid, solver, keep_clear, rng): break
+            total_repairs += 1
+    return Generated_board(seed, None, max_layouts, total_repairs, time.perf_counter() - start_time)
+
+
+def generate_chunk(size, bombs, seeds, max_repairs=None, backend="bytearray") -> list[Generated_board]:
+    return [generate_board(size, bombs, seed, max_repairs=max_repairs, solver_class=BACKENDS[backend]) for seed in seeds]
+
+
+"""
+Generate boards across a process pool, one chunk of seeds per task, yielding them as chunks finish.
+Like batch_runner.run_games_parallel, only a bounded number of chunks is in flight at once (see run_bounded).
+"""
+def generate_boards(size, bombs, num_boards, base_seed=0, workers=None, chunk_size=16, max_repairs=None, backend="bytearray"):
+    chunks = (
+        [game_seed(base_seed, index) for index in range(first, min(first + chunk_size, num_boards))]
+        for first in range(0, num_boards, chunk_size)
+    )
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for seeds in chunks: yield from generate_chunk(size, bombs, seeds, max_repairs, backend)
+        return
+    yield from run_bounded(generate_chunk, ((size, bombs, seeds, max_repairs, backend) for seeds in chunks), workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate boards the solver finishes without guessing, into a position log.")
+    parser.add_argument("--boards", type=int, default=1000, help="boards to generate")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="25x140", help="board size and bomb count")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; board i uses a seed derived from it")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes; 0 uses every core")
+    parser.add_argument("--max-repairs", type=int, help="mines moved before a layout is rejected (default: the bomb count)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="bytearray", help="solver backend to check boards with")
+    parser.add_argument("--output", default=NO_GUESS_LOG, help="position log to append the boards to")
+    args = parser.parse_args()
+
+    size, bombs = PRESETS[args.preset]
+    generated = failed = layouts = repairs = 0
+    start = time.perf_counter()
+    with Position_log_writer(args.output) as log:
+        for board in generate_boards(size, bombs, args.boards, args.seed, args.workers or None, max_repairs=args.max_repairs, backend=args.backend):
+            layouts += board.layouts
+            repairs += board.repairs
+            if board.position is None:
+                failed += 1
+                continue
+            log.write(board.position)
+            generated += 1
+    elapsed = time.perf_counter() - start
+    print(f"{generated} boards in {elapsed:.2f} s ({generated / elapsed:.1f} boards/s), {failed} failed, "
+          f"{layouts / max(args.boards, 1):.2f} layouts and {repairs / max(args.boards, 1):.1f} repairs per board, written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os, queue, struct, threading, zlib
+import pygame
+
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+"""
+Write RGB pixels as a PNG file.
+
+zlib does the compression and releases the GIL while it runs, so frames can be encoded on a
+background thread without holding up the game.
+"""
+def write_png(path, pixels, size):
+    width, height = size
+    stride = width * 3
+    # every row starts with filter type 0 (none)
+    rows = b"".join(b"\x00" + pixels[row * stride:(row + 1) * stride] for row in range(height))
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(png_chunk(b"IDAT", zlib.compress(rows, 6)))
+        f.write(png_chunk(b"IEND", b""))
+
+
+class Frame_recorder:
+    """
+    Records the screen to numbered PNG files without slowing down the caller.
+
+    capture() only copies the screen's pixels into a bounded queue; a background thread encodes and
+    writes them. A frame identical to the one before it is skipped, and when the encoder falls
+    behind and the queue is full, new frames are dropped instead of blocking the game.
+    With gif_path set, the PNG files are also made into an animated GIF on close (needs Pillow); they are
+    read back one at a time, so no frame is kept in memory while recording.
+    """
+    def __init__(self, directory="rec/frames", max_queued=64, gif_path=None, frame_duration=100) -> None:
+        self.directory = directory
+        self.gif_path = gif_path
+        # milliseconds each frame is shown in the GIF
+        self.frame_duration = frame_duration
+        self.frames = queue.Queue(max_queued)
+        self.last_pixels = None
+        self.frame_number = 0
+        self.captured = 0
+        self.duplicates = 0
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        self.encoder = threading.Thread(target=self.encode_frames, daemon=True)
+        self.encoder.start()
+
+    def capture(self, surface):
+        # four bytes per pixel is a straight copy of the screen, the padding byte is stripped on the encoder thread
+        pixels = pygame.image.tobytes(surface, "RGBX")
+        if pixels == self.last_pixels:
+            self.duplicates += 1
+            return
+        self.last_pixels = pixels
+        try:
+            self.frames.put_nowait((pixels, surface.get_size()))
+            self.captured += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def encode_frames(self):
+        while True:
+            frame = self.frames.get()
+            if frame is None: return
+            padded_pixels, size = frame
+            pixels = bytearray(len(padded_pixels) // 4 * 3)
+            for channel in range(3):
+                pixels[channel::3] = padded_pixels[channel::4]
+            write_png(self.frame_path(self.frame_number), pixels, size)
+            self.frame_number += 1
+
+    def frame_path(self, frame_number):
+        return os.path.join(self.directory, "%04d.png" % frame_number)
+
+    """
+    Wait for the queued frames to be written, then write the GIF if one was asked for.
+    """
+    def close(self):
+        self.frames.put(None)
+        self.encoder.join()
+        if self.gif_path is not None and self.frame_number:
+            self.write_gif()
+
+    def write_gif(self):
+        try:
+            from PIL import Image
+        except ImportError:
+            print(f"Pillow is not installed, {self.gif_path} was not written (the PNG frames are in {self.directory})")
+            return
+
+        def read_frame(frame_number):
+            with Image.open(self.frame_path(frame_number)) as image:
+                return image.convert("RGB")
+
+        # a generator, so Pillow takes in each frame as it goes instead of every frame being decoded up front
+        rest = (read_frame(frame_number) for frame_number in range(1, self.frame_number))
+        read_frame(0).save(self.gif_path, save_all=True, append_images=rest, duration=self.frame_duration, loop=0)
+
+    def stats(self):
+        return {
+            "captured": self.captured,
+            "written": self.frame_number,
+            "duplicates": self.duplicates,
+            "dropped": self.dropped,
+        }
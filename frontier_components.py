@@ -0,0 +1,197 @@
+from game_emulation import State
+
+
+class Constraint:
+    def __init__(self, source, cells, mines) -> None:
+        # revealed cell the number comes from
+        self.source = source
+        # covered cells around the source
+        self.cells = cells
+        # mines among those cells that haven't been flagged yet
+        self.mines = mines
+
+
+class Component:
+    def __init__(self, cells, constraints) -> None:
+        self.cells = cells
+        self.constraints = constraints
+
+
+class Enumeration:
+    def __init__(self, cells, solutions_by_mines, mine_counts_by_mines) -> None:
+        self.cells = cells
+        # number of valid mine assignments using k mines, and how many of those put a mine on each cell
+        self.solutions_by_mines = solutions_by_mines
+        self.mine_counts_by_mines = mine_counts_by_mines
+        # the same counts over every k
+        self.solutions = sum(solutions_by_mines.values())
+        self.mine_counts = [sum(counts) for counts in zip(*mine_counts_by_mines.values())] or [0] * len(cells)
+
+    def safe_cells(self) -> list[int]:
+        if not self.solutions: return []
+        return [cell for cell, count in zip(self.cells, self.mine_counts) if count == 0]
+
+    def mine_cells(self) -> list[int]:
+        if not self.solutions: return []
+        return [cell for cell, count in zip(self.cells, self.mine_counts) if count == self.solutions]
+
+
+"""
+Build one constraint per frontier cell from the solver grid.
+
+Returns list of Constraint.
+"""
+def build_constraints(solver_grid:bytearray, frontier, neighbors, adjacent_bombs) -> list[Constraint]:
+    constraints = []
+    deltas = neighbors.deltas
+    kinds = neighbors.kinds
+    for source in sorted(frontier):
+        around = tuple(map(source.__add__, deltas[kinds[source]]))
+        covered = tuple(neighbor for neighbor in around if solver_grid[neighbor] == State.COVERED)
+        if not covered: continue
+        num_flagged = sum(1 for neighbor in around if solver_grid[neighbor] == State.FLAGGED)
+        constraints.append(Constraint(source, covered, adjacent_bombs[source] - num_flagged))
+    return constraints
+
+
+"""
+Compare overlapping constraints: when constraint A's cells are a subset of B's, the cells of B
+that aren't in A hold exactly B.mines - A.mines mines. That difference is added as a new constraint,
+and the comparison repeats until no new constraint turns up or max_constraints is reached.
+
+Returns (safe_cells, mine_cells) from every constraint whose mines are all or none of its cells.
+"""
+def subset_reduction(constraints:list[Constraint], max_constraints=2000):
+    known = {}
+    for constraint in constraints:
+        known[frozenset(constraint.cells)] = constraint.mines
+    constraints_of_cell = {}
+    for cells in known:
+        for cell in cells:
+            constraints_of_cell.setdefault(cell, set()).add(cells)
+
+    worklist = list(known)
+    while worklist and len(known) < max_constraints:
+        cells = worklist.pop()
+        mines = known[cells]
+        # a constraint can only be a subset or superset of this one if they share a cell
+        candidates = set()
+        for cell in cells:
+            candidates.update(constraints_of_cell[cell])
+        for other in candidates:
+            if other == cells: continue
+            if cells < other: smaller, larger = cells, other
+            elif other < cells: smaller, larger = other, cells
+            else: continue
+            difference = larger - smaller
+            if difference in known: continue
+            known[difference] = known[larger] - known[smaller]
+            for cell in difference:
+                constraints_of_cell[cell].add(difference)
+            worklist.append(difference)
+
+    safe_cells = set()
+    mine_cells = set()
+    for cells, mines in known.items():
+        if mines == 0: safe_cells.update(cells)
+        elif mines == len(cells): mine_cells.update(cells)
+    return sorted(safe_cells), sorted(mine_cells)
+
+
+"""
+Split constraints into independent components: two constraints are in the same component
+when they share a covered cell, directly or through other constraints.
+
+Returns list of Component, each with its cells in the order they are first reached.
+"""
+def split_components(constraints:list[Constraint]) -> list[Component]:
+    constraints_of_cell = {}
+    for constraint in constraints:
+        for cell in constraint.cells:
+            constraints_of_cell.setdefault(cell, []).append(constraint)
+
+    components = []
+    seen_constraints = set()
+    for first in constraints:
+        if id(first) in seen_constraints: continue
+        seen_constraints.add(id(first))
+        cells = []
+        seen_cells = set()
+        component_constraints = [first]
+        # breadth first, so neighboring cells are enumerated one after another and prune early
+        for constraint in component_constraints:
+            for cell in constraint.cells:
+                if cell in seen_cells: continue
+                seen_cells.add(cell)
+                cells.append(cell)
+                for other in constraints_of_cell[cell]:
+                    if id(other) in seen_constraints: continue
+                    seen_constraints.add(id(other))
+                    component_constraints.append(other)
+        components.append(Component(cells, component_constraints))
+    return components
+
+
+# steps of enumerate_component's backtracking between two looks at its budget
+BUDGET_CHECK_STEPS = 1024
+
+
+class _Out_of_budget(Exception):
+    pass
+
+
+"""
+Enumerate every mine assignment of a component that satisfies all of its constraints.
+
+Backtracks over the cells in order and prunes as soon as a constraint has too many mines
+or too few cells left to place the mines it still needs.
+With a Solver_budget, gives up once it runs out, checking every BUDGET_CHECK_STEPS steps.
+Returns an Enumeration, or None if the budget ran out first.
+"""
+def enumerate_component(component:Component, budget=None) -> Enumeration:
+    cells = component.cells
+    position = {cell: i for i, cell in enumerate(cells)}
+    remaining = [constraint.mines for constraint in component.constraints]
+    unassigned = [len(constraint.cells) for constraint in component.constraints]
+    constraints_of_cell = [[] for _ in cells]
+    for constraint_id, constraint in enumerate(component.constraints):
+        for cell in constraint.cells:
+            constraints_of_cell[position[cell]].append(constraint_id)
+
+    if any(mines < 0 or mines > count for mines, count in zip(remaining, unassigned)):
+        return Enumeration(cells, {}, {})
+
+    solutions_by_mines = {}
+    mine_counts_by_mines = {}
+    assignment = [0] * len(cells)
+    steps = 0
+
+    def assign(i):
+        nonlocal steps
+        steps += 1
+        if budget is not None and steps % BUDGET_CHECK_STEPS == 0 and budget.exhausted(): raise _Out_of_budget
+        if i == len(cells):
+            num_mines = sum(assignment)
+            solutions_by_mines[num_mines] = solutions_by_mines.get(num_mines, 0) + 1
+            mine_counts = mine_counts_by_mines.setdefault(num_mines, [0] * len(cells))
+            for j, mine in enumerate(assignment):
+                if mine: mine_counts[j] += 1
+            return
+        ids = constraints_of_cell[i]
+        for mine in (0, 1):
+            if all(0 <= remaining[c] - mine <= unassigned[c] - 1 for c in ids):
+                for c in ids:
+                    remaining[c] -= mine
+                    unassigned[c] -= 1
+                assignment[i] = mine
+                assign(i + 1)
+                for c in ids:
+                    remaining[c] += mine
+                    unassigned[c] += 1
+        assignment[i] = 0
+
+    try:
+        assign(0)
+    except _Out_of_budget:
+        return None
+    return Enumeration(cells, solutions_by_mines, mine_counts_by_mines)
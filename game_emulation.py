@@ -1,138 +1,158 @@
-import pygame
-from enum import Enum
+from enum import IntEnum
 import random
 from functools import singledispatch
+from position_log import Position
+from neighbor_table import neighbor_table
 
-class Tile:    
-    def __init__(self, covered=True, has_bomb=False, adjacent_bombs=0, flagged=False) -> None: 
-        self.covered = covered
-        self.has_bomb = has_bomb
-        self.adjacent_bombs = adjacent_bombs
-        self.flagged = flagged
-
-class State(Enum):
+class State(IntEnum):
     COVERED = 0
     FLAGGED = 1
     REVEALED = 2
 
 
 class Game_grid:
-    def __init__(self, grid_size, num_bombs, tile_draw_size = 32, load=[]) -> None:
+    """
+    Board state stored as flat byte arrays indexed by cell id (row * size + col).
+
+    covered, flagged, has_bomb and adjacent_bombs hold one byte per cell, and neighbors is the
+    shared Neighbor_table of the cell ids around each cell. The solver reads these arrays directly.
+    """
+    def __init__(self, grid_size, num_bombs, tile_draw_size = 32, load=[], rng=None) -> None:
         self.tile_draw_size = tile_draw_size
+        # bombs are placed with the global random module unless a seeded random.Random is passed in
+        self.rng = rng if rng is not None else random
         self.bombs = num_bombs
         self.size = grid_size
-        if load: 
-            self.tiles = [ [Tile(cov, bomb, num, flag) for (cov, bomb, num, flag) in row] for row in load]
-        else: 
-            self.tiles = [ [Tile() for x in range(grid_size)] for y in range(grid_size)]
-        self.font = pygame.font.Font(None, 30)
+        num_cells = grid_size * grid_size
+        self.covered = bytearray(b"\x01") * num_cells
+        self.flagged = bytearray(num_cells)
+        self.has_bomb = bytearray(num_cells)
+        self.adjacent_bombs = bytearray(num_cells)
+        # shared by every grid of this size, see neighbor_table.py
+        self.neighbor_table = neighbor_table(grid_size)
+        self.neighbors = self.neighbor_table
+        if isinstance(load, Position):
+            self.covered[:] = load.covered
+            self.has_bomb[:] = load.has_bomb
+            self.flagged[:] = load.flagged
+            self.count_adjacent_bombs()
+        elif load: 
+            cells = [cell for row in load for cell in row]
+            self.covered[:] = bytes(bool(cov) for cov, _, _, _ in cells)
+            self.has_bomb[:] = bytes(bool(bomb) for _, bomb, _, _ in cells)
+            self.adjacent_bombs[:] = bytes(num for _, _, num, _ in cells)
+            self.flagged[:] = bytes(bool(flag) for _, _, _, flag in cells)
         self.game_started = True if load else False
+        self.exploded = bool(load) and any(bomb and not covered for bomb, covered in zip(self.has_bomb, self.covered))
 
-        self.red_flag_sprite = pygame.image.load('img/emoji_u1f6a9.svg')
-        self.red_flag_sprite = pygame.transform.scale(self.red_flag_sprite, (25, 25))
+        # only created by the first draw, so headless games never import pygame
+        self.renderer = None
 
-        self.bomb_sprite = pygame.image.load('img/emoji_u1f4a3.svg')
-        self.bomb_sprite =  pygame.transform.scale(self.bomb_sprite, (25, 25))
-        # self.lock_sprite = seguisy80.render('🔒', True, (255, 0, 0))
+    def index(self, row, col):
+        return row * self.size + col
 
+    def row_col(self, index):
+        return divmod(index, self.size)
 
     def start_game(self, init_row, init_col):
         if init_row == None: init_row = self.size//2
         if init_col == None: init_col = self.size//2
 
-        choices = [i for i in range(self.size**2)]
-
         #keep the area around the starting square clear
-        for dy in range(-1, 2, 1):
-            for dx in range(-1, 2, 1):
-                d_row = init_row + dy
-                d_col = init_col + dx
-                if self.in_game_grid(d_row, d_col):
-                    site_index = d_row * self.size + d_col
-                    choices.remove(site_index)
-
-        # place the bombs
-        for _ in range(self.bombs):
-            site = random.choice(choices)
-            choices.remove(site)
-            row = site // self.size
-            col = site % self.size
-            self.tiles[row][col].has_bomb = True
-            self.tiles[row][col].adjacent_bombs = 0
-            #incrememt adjacent counts around newly-placed bomb 
-            for dy in range(-1, 2, 1):
-                for dx in range(-1, 2, 1):
-                    d_row = row + dy
-                    d_col = col + dx
-                    if self.in_game_grid(d_row, d_col):
-                        tile = self.tiles[d_row][d_col]
-                        if not tile.has_bomb:
-                            tile.adjacent_bombs += 1
+        start_area = {init_row * self.size + init_col}
+        start_area.update(self.neighbors[init_row * self.size + init_col])
+        choices = [i for i in range(self.size**2) if i not in start_area]
+
+        # place the bombs, sampling without replacement in time linear in the number of cells
+        sites = self.rng.sample(choices, self.bombs)
+        has_bomb = self.has_bomb
+        for site in sites:
+            has_bomb[site] = 1
+        self.count_adjacent_bombs()
+
+    """
+    Fill adjacent_bombs from has_bomb in one pass over the whole board (see Neighbor_table.count_around).
+    Cells holding a bomb get 0, masked off with has_bomb times 0xff, a byte per cell.
+    """
+    def count_adjacent_bombs(self):
+        num_cells = self.size * self.size
+        counts = int.from_bytes(self.neighbor_table.count_around(self.has_bomb), "little")
+        bomb_bytes = int.from_bytes(self.has_bomb, "little") * 0xff
+        self.adjacent_bombs[:] = (counts & ~bomb_bytes).to_bytes(num_cells, "little")
     
     def in_game_grid(self, row, col) -> bool:
         return row >= 0 and row < self.size and col >= 0 and col < self.size
 
+    """
+    Draw the cells that changed since the last draw onto screen.
+    Returns the changed rectangles, to pass to pygame.display.update.
+    """
     def draw(self, screen):
-        dsize = self.tile_draw_size
-        for row in range(self.size):
-            for col in range(self.size):
-                tile = self.tiles[row][col]
-                if not tile.covered: 
-                    pygame.draw.rect(
-                            screen, 
-                            (150, 150, 150), 
-                            (col * dsize, row * dsize, dsize, dsize),
-                    )
-                    if tile.has_bomb:  
-                        surface_x, surface_y = self.bomb_sprite.get_size() 
-                        screen.blit(self.bomb_sprite, (col * dsize + dsize//2 - surface_x//2, row * dsize + dsize//2 - surface_y//2))
-                else:
-                    pygame.draw.rect(
-                                screen, 
-                                (100, 100, 100), 
-                                (col * dsize, row * dsize, dsize, dsize),
-                        )
-                pygame.draw.rect(
-                    screen, 
-                    (0, 0, 0), 
-                    (col * dsize, row * dsize, dsize, dsize),
-                    width=1
-                )
-
-                if tile.flagged:
-                    surface_x, surface_y = self.red_flag_sprite.get_size() 
-                    screen.blit(self.red_flag_sprite, (col * dsize + dsize//2 - surface_x//2, row * dsize + dsize//2 - surface_y//2))
-
-                if tile.covered or tile.adjacent_bombs == 0: continue
-                text_surface = self.font.render(str(tile.adjacent_bombs), True, (255, 255, 255))
-                surface_x, surface_y = text_surface.get_size() 
-                screen.blit(text_surface, (col * dsize + dsize//2 - surface_x//2, row * dsize + dsize//2 - surface_y//2))
+        # imported here rather than at the top so that only games that are drawn import pygame
+        from grid_renderer import Grid_renderer
+        if self.renderer is None or self.renderer.screen is not screen:
+            self.renderer = Grid_renderer(self, screen)
+        return self.renderer.draw()
     
-    def uncover_tile(self, row, col):
+    """
+    Uncover a tile, and flood fill outwards from it if it has no adjacent bombs.
+    Every cell uncovered is appended to changed, if it is given.
+    """
+    def uncover_tile(self, row, col, changed=None):
         if not self.in_game_grid(row, col): return
         if not self.game_started:
             self.start_game(row, col)
             self.game_started = True
         
-        tile = self.tiles[row][col]
-        if not tile.covered: return
-        tile.covered = False
-        tile.flagged = False
-        if tile.adjacent_bombs != 0 or tile.has_bomb: return 
-
-        #if a tile has 0 adjacent_bombs uncover it's neighbors
-        for dy in range(-1, 2, 1):
-            for dx in range(-1, 2, 1):
-                d_row = row + dy
-                d_col = col + dx
-                if self.in_game_grid(d_row, d_col):
-                    self.uncover_tile(d_row, d_col)
+        index = row * self.size + col
+        if not self.covered[index]: return
+        self.covered[index] = 0
+        self.flagged[index] = 0
+        if changed is not None: changed.append(index)
+        if self.has_bomb[index]: self.exploded = True
+        if self.adjacent_bombs[index] != 0 or self.has_bomb[index]: return 
+
+        #if a tile has 0 adjacent_bombs uncover it's neighbors, with an explicit stack so big open regions don't recurse
+        covered = self.covered
+        flagged = self.flagged
+        adjacent_bombs = self.adjacent_bombs
+        deltas = self.neighbor_table.deltas
+        kinds = self.neighbor_table.kinds
+        stack = [index]
+        while stack:
+            cell = stack.pop()
+            for delta in deltas[kinds[cell]]:
+                neighbor = cell + delta
+                if not covered[neighbor]: continue
+                covered[neighbor] = 0
+                flagged[neighbor] = 0
+                if changed is not None: changed.append(neighbor)
+                # a zero tile has no bombs around it, so the flood never uncovers one
+                if adjacent_bombs[neighbor] == 0: stack.append(neighbor)
     
-    def flag_tile(self, row, col, flagged=None):
+    def flag_tile(self, row, col, flagged=None, changed=None):
         if not self.in_game_grid(row, col): return
-        tile = self.tiles[row][col]
-        if tile.covered:
-            tile.flagged = flagged if flagged != None else not tile.flagged
+        index = row * self.size + col
+        if self.covered[index]:
+            new_flag = flagged if flagged != None else not self.flagged[index]
+            if changed is not None and bool(new_flag) != bool(self.flagged[index]): changed.append(index)
+            self.flagged[index] = new_flag
+
+    """
+    Apply a batch of (action, cell) pairs: State.REVEALED uncovers the cell, State.FLAGGED flags it
+    and State.COVERED removes its flag.
+
+    Returns the journal of cells whose covered or flagged state changed, flood fills included,
+    in the order they changed.
+    """
+    def apply_actions(self, batch) -> list[int]:
+        changed = []
+        for action, cell in batch:
+            row, col = divmod(cell, self.size)
+            if action == State.REVEALED: self.uncover_tile(row, col, changed)
+            elif action == State.FLAGGED: self.flag_tile(row, col, True, changed)
+            elif action == State.COVERED: self.flag_tile(row, col, False, changed)
+        return changed
         
 
     def mouse_to_row_col(self, mouse_x, mouse_y = None):
@@ -140,6 +160,16 @@ class Game_grid:
             return (mouse_x[1]//self.tile_draw_size, mouse_x[0]//self.tile_draw_size)
         return (mouse_y//self.tile_draw_size, mouse_x//self.tile_draw_size)
 
+    def won(self) -> bool:
+        return self.game_started and self.covered == self.has_bomb
+
+    def lost(self) -> bool:
+        return self.exploded
+
     def dump(self):
-        return [[(tile.covered, tile.has_bomb, tile.adjacent_bombs, tile.flagged) for tile in row] for row in self.tiles]
+        cells = [
+            (bool(cov), bool(bomb), num, bool(flag))
+            for cov, bomb, num, flag in zip(self.covered, self.has_bomb, self.adjacent_bombs, self.flagged)
+        ]
+        return [cells[row * self.size:(row + 1) * self.size] for row in range(self.size)]
     
@@ -0,0 +1,134 @@
+from functools import lru_cache
+import pygame
+import sprite_cache
+
+# what a cell looks like, one byte per cell
+COVERED_TILE = 0
+FLAGGED_TILE = 1
+REVEALED_TILE = 2
+BOMB_TILE = 3
+# revealed tiles with a number n are NUMBER_TILE + n
+NUMBER_TILE = 3
+# never drawn, or drawn over by something else
+STALE_TILE = 255
+
+
+_NONZERO = bytes([0]) + bytes([1]) * 255
+
+
+def changed_cells(old:bytes, new:bytes) -> list[int]:
+    # xor the two arrays as big integers and find the nonzero bytes, so unchanged cells cost nothing in Python
+    diff = (int.from_bytes(old, "big") ^ int.from_bytes(new, "big")).to_bytes(len(new), "big").translate(_NONZERO)
+    cells = []
+    cell = diff.find(1)
+    while cell != -1:
+        cells.append(cell)
+        cell = diff.find(1, cell + 1)
+    return cells
+
+
+"""
+Render the surface of every tile look at a tile size, once per process.
+Returns {tile look: surface}, shared by every renderer, so the surfaces must only be blitted from.
+"""
+@lru_cache(maxsize=4)
+def render_tiles(dsize):
+    font = sprite_cache.font(30)
+
+    def tile(color, sprite=None):
+        surface = pygame.Surface((dsize, dsize))
+        surface.fill(color)
+        pygame.draw.rect(surface, (0, 0, 0), (0, 0, dsize, dsize), width=1)
+        if sprite is not None:
+            surface_x, surface_y = sprite.get_size()
+            surface.blit(sprite, (dsize//2 - surface_x//2, dsize//2 - surface_y//2))
+        return surface
+
+    tiles = {
+        COVERED_TILE: tile((100, 100, 100)),
+        FLAGGED_TILE: tile((100, 100, 100), sprite_cache.sprite(sprite_cache.RED_FLAG_SPRITE, (25, 25))),
+        REVEALED_TILE: tile((150, 150, 150)),
+        BOMB_TILE: tile((150, 150, 150), sprite_cache.sprite(sprite_cache.BOMB_SPRITE, (25, 25))),
+    }
+    for number in range(1, 9):
+        tiles[NUMBER_TILE + number] = tile((150, 150, 150), font.render(str(number), True, (255, 255, 255)))
+    return tiles
+
+
+class Grid_renderer:
+    """
+    Draws a Game_grid onto a screen one cell at a time, from a pre-rendered surface per tile look.
+
+    It keeps a copy of the covered and flagged arrays from the last draw, so each draw only finds and
+    blits the cells that changed and returns their rectangles for pygame.display.update.
+    """
+    def __init__(self, game_grid, screen) -> None:
+        self.game_grid = game_grid
+        self.screen = screen
+        self.tiles = render_tiles(game_grid.tile_draw_size)
+        # the look each cell was last drawn with
+        self.drawn = bytearray([STALE_TILE]) * (game_grid.size * game_grid.size)
+        self.covered = bytes(game_grid.covered)
+        self.flagged = bytes(game_grid.flagged)
+        # cells to redraw whatever their state, and whether the whole grid needs drawing
+        self.stale = set()
+        self.redraw_all = True
+        self.game_started = game_grid.game_started
+        self.redrawn = []
+
+    def tile_look(self, cell):
+        game_grid = self.game_grid
+        if game_grid.covered[cell]: return FLAGGED_TILE if game_grid.flagged[cell] else COVERED_TILE
+        if game_grid.has_bomb[cell]: return BOMB_TILE
+        num = game_grid.adjacent_bombs[cell]
+        return NUMBER_TILE + num if num else REVEALED_TILE
+
+    """
+    Mark cells as needing a redraw, after something else was drawn over them.
+    With no cells, the whole grid is redrawn.
+    """
+    def invalidate(self, cells=None):
+        if cells is None: self.redraw_all = True
+        else: self.stale.update(cells)
+
+    """
+    Blit every cell whose look changed since it was last drawn.
+
+    Returns the list of rectangles that changed.
+    """
+    def draw(self) -> list:
+        game_grid = self.game_grid
+        if game_grid.game_started != self.game_started:
+            # the bombs and numbers were only just placed
+            self.game_started = game_grid.game_started
+            self.redraw_all = True
+        if self.redraw_all:
+            cells = range(len(self.drawn))
+            self.drawn[:] = bytes([STALE_TILE]) * len(self.drawn)
+        else:
+            cells = self.stale
+            if game_grid.covered != self.covered: cells.update(changed_cells(self.covered, game_grid.covered))
+            if game_grid.flagged != self.flagged: cells.update(changed_cells(self.flagged, game_grid.flagged))
+            for cell in self.stale:
+                self.drawn[cell] = STALE_TILE
+        self.covered = bytes(game_grid.covered)
+        self.flagged = bytes(game_grid.flagged)
+
+        blit = self.screen.blit
+        tiles = self.tiles
+        drawn = self.drawn
+        dsize = game_grid.tile_draw_size
+        size = game_grid.size
+        rects = []
+        # the cells blitted by this draw, for anything drawn on top of them
+        self.redrawn = []
+        for cell in cells:
+            look = self.tile_look(cell)
+            if look == drawn[cell]: continue
+            drawn[cell] = look
+            self.redrawn.append(cell)
+            row, col = divmod(cell, size)
+            rects.append(blit(tiles[look], (col * dsize, row * dsize)))
+        self.stale = set()
+        self.redraw_all = False
+        return rects
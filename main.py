@@ -1,9 +1,12 @@
 import pygame
 from game_emulation import Game_grid
 from minesweeper_solver import Solver 
+from solver_display import Pygame_observer
+from frame_recorder import Frame_recorder
+from solver_thread import Solver_thread
 
 def proccess_events(game_grid):
-    global screen
+    global screen, autosolver
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             return None
@@ -16,12 +19,17 @@ def proccess_events(game_grid):
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r:
                 game_grid = Game_grid(game_grid.size, game_grid.bombs)
-                game_grid.draw(screen)
+                if autosolver is not None: autosolver.stop()
+                autosolver = None
                 print(game_grid)
+            if event.key == pygame.K_a and autosolver is None:
+                autosolver = Solver_thread(game_grid).start()
             if event.key == pygame.K_s:
-                solver = Solver(game_grid, screen)
+                observer = Pygame_observer(game_grid, screen, recorder=recorder)
+                solver = Solver(game_grid, observer)
                 slow_mod = event.mod & pygame.KMOD_SHIFT
-                solver.run_iteration(game_grid, screen, slow=slow_mod)
+                solver.run_iteration(game_grid, slow=slow_mod)
+                observer.erase()
 
     return game_grid
 
@@ -36,34 +44,37 @@ pygame.display.set_caption("minesweeper")
 
 # Set up screen capture
 recording = True
-frame_number = 0
+recorder = Frame_recorder("rec/frames") if recording else None
 
-def update_and_save():
-    global frame_number
-    filename = "rec/frames/%04d.png" % (frame_number)
-    pygame.image.save(screen, filename)
-    frame_number += 1
-    return pygame.display.update
-
-if recording: pygame.display.update = update_and_save
 
 
+# the solver playing on a worker thread after 'a' is pressed, and how many of its actions to show per frame
+autosolver = None
+actions_per_frame = 4
+frame_rate = 30
+clock = pygame.time.Clock()
 
 running = True
 while game_grid is not None:
-    # Fill the background with white
-    screen.fill((255, 255, 255))
+    #Play the next few of the autosolver's actions
+    if autosolver is not None:
+        autosolver.apply_events(game_grid, actions_per_frame)
+        if autosolver.finished: autosolver = None
 
-    #Draw game grid
-    game_grid.draw(screen)
+    #Draw the tiles that changed
+    changed_rects = game_grid.draw(screen)
 
     # Did the user click the window close button?
     game_grid = proccess_events(game_grid)
 
-    # Flip the display
-    pygame.display.flip()
-
-    #Take a screnshot
+    # Update only the changed part of the display
+    if changed_rects: 
+        pygame.display.update(changed_rects)
+        #Take a screnshot
+        if recorder is not None: recorder.capture(screen)
+    clock.tick(frame_rate)
 
 # Done! Time to quit.
+if autosolver is not None: autosolver.stop()
+if recorder is not None: recorder.close()
 pygame.quit()
\ No newline at end of file
@@ -0,0 +1,100 @@
+from math import comb
+from frontier_components import Enumeration
+from game_emulation import State
+
+
+class Mine_probabilities:
+    def __init__(self, probabilities, safe_cells, mine_cells) -> None:
+        # cell -> probability that it holds a mine, for every covered unflagged cell
+        self.probabilities = probabilities
+        # cells that are certain once the bomb count is taken into account
+        self.safe_cells = safe_cells
+        self.mine_cells = mine_cells
+
+    """
+    Pick the covered cell least likely to hold a mine.
+
+    Ties go to the lowest cell id so that games replay the same way.
+    Returns (cell, probability), or None when there is nothing left to reveal.
+    """
+    def best_guess(self):
+        if not self.probabilities: return None
+        cell = min(self.probabilities, key=lambda cell: (self.probabilities[cell], cell))
+        return cell, self.probabilities[cell]
+
+    """
+    The certain cells as solver actions: reveal every safe cell, flag every mine.
+    """
+    def certain_actions(self):
+        return [(State.REVEALED, cell) for cell in self.safe_cells] + [(State.FLAGGED, cell) for cell in self.mine_cells]
+
+
+def convolve(left, right):
+    result = {}
+    for left_mines, left_count in left.items():
+        for right_mines, right_count in right.items():
+            result[left_mines + right_mines] = result.get(left_mines + right_mines, 0) + left_count * right_count
+    return result
+
+
+"""
+Combine the enumerated frontier components with the bomb count.
+
+Every way of choosing k_j mines in component j is weighted by the number of ways the remaining
+mines fit in the unconstrained cells, C(len(unconstrained_cells), mines_left - sum of k_j).
+All counts are exact Python integers, so the weights never overflow or lose precision.
+Returns Mine_probabilities.
+"""
+def mine_probabilities(enumerations:list[Enumeration], unconstrained_cells, mines_left) -> Mine_probabilities:
+    num_unconstrained = len(unconstrained_cells)
+    enumerations = [enumeration for enumeration in enumerations if enumeration.cells]
+
+    # distribution of the total number of mines over every component but one, for each one left out
+    prefixes = [{0: 1}]
+    for enumeration in enumerations:
+        prefixes.append(convolve(prefixes[-1], enumeration.solutions_by_mines))
+    suffixes = [{0: 1}]
+    for enumeration in reversed(enumerations):
+        suffixes.append(convolve(suffixes[-1], enumeration.solutions_by_mines))
+    suffixes.reverse()
+
+    def weight(frontier_mines):
+        outside_mines = mines_left - frontier_mines
+        if outside_mines < 0 or outside_mines > num_unconstrained: return 0
+        return comb(num_unconstrained, outside_mines)
+
+    total = sum(count * weight(mines) for mines, count in prefixes[-1].items())
+    if total == 0:
+        return Mine_probabilities({}, [], [])
+
+    numerators = {}
+    for j, enumeration in enumerate(enumerations):
+        others = convolve(prefixes[j], suffixes[j + 1])
+        cell_numerators = [0] * len(enumeration.cells)
+        for mines, mine_counts in enumeration.mine_counts_by_mines.items():
+            ways = sum(count * weight(mines + other_mines) for other_mines, count in others.items())
+            if not ways: continue
+            for i, mine_count in enumerate(mine_counts):
+                cell_numerators[i] += mine_count * ways
+        for cell, numerator in zip(enumeration.cells, cell_numerators):
+            numerators[cell] = numerator
+
+    probabilities = {}
+    safe_cells = []
+    mine_cells = []
+
+    def add(cell, numerator, denominator):
+        if numerator == 0: safe_cells.append(cell)
+        elif numerator == denominator: mine_cells.append(cell)
+        probabilities[cell] = numerator / denominator
+
+    for cell, numerator in numerators.items():
+        add(cell, numerator, total)
+    if num_unconstrained:
+        # each unconstrained cell holds a mine in outside_mines / num_unconstrained of the placements
+        outside_numerator = sum(
+            count * weight(mines) * (mines_left - mines) for mines, count in prefixes[-1].items()
+        )
+        for cell in unconstrained_cells:
+            add(cell, outside_numerator, total * num_unconstrained)
+    return Mine_probabilities(probabilities, sorted(safe_cells), sorted(mine_cells))
@@ -1,445 +1,770 @@
-import pygame
-from itertools import combinations
-import copy, os
-from game_emulation import State, Game_grid
-
-class Solver_Tile:
-    def __init__(self) -> None:
-        self.state = State.COVERED
-        self.flagged_bombs = 0
-        self.adjacent_bombs = 0
-        self.neighbors = []
-        self.locked = False
-        self.row = -1
-        self.col = -1
-
-    def get_neighbors_of_state(self, state):
-        return [neighbor for neighbor in self.neighbors if neighbor.state == state]
-
-    def covered(self): 
-        return self.state == State.COVERED
-    
-    def flagged(self):
-        return self.state == State.FLAGGED
-
-    def revealed(self):
-        return self.state == State.REVEALED
-    
-
-class Solver:
-    class Overlay:
-        def __init__(self, row, col, color, delay = 0) -> None:
-            self.row = row
-            self.col = col
-            self.color = color
-            self.delay = delay
-    
-
-    def __init__(self, game_grid:Game_grid, screen, debug=False) -> None:
-        self.screen = screen
-        self.font = pygame.font.Font(None, 20)
-        self.game_grid = game_grid
-        # First move always in the center
-        if not game_grid.game_started:
-            game_grid.uncover_tile(game_grid.size //2 , game_grid.size // 2)
-        self.tiles = [[Solver_Tile() for col in range(game_grid.size) ] for row in range(game_grid.size)]
-        self.extract_state(self.tiles)
-        self.overlays = []
-        self.debug = debug
-
-    """Extract state from the game emulator to the solver tiles passed into it"""
-    def extract_state(self, grid:list[list[Solver_Tile]]):
-        for row in range(self.game_grid.size):
-            for col in range(self.game_grid.size):
-                my_tile = grid[row][col]
-                other_tile = self.game_grid.tiles[row][col]
-                if other_tile.flagged:
-                    my_tile.state = State.FLAGGED
-                elif not other_tile.covered:
-                    my_tile.state = State.REVEALED
-                else:
-                    my_tile.state = State.COVERED
-                if my_tile.revealed():
-                    my_tile.adjacent_bombs = other_tile.adjacent_bombs
-                my_tile.row = row
-                my_tile.col = col
-                if len(my_tile.neighbors) != 0: continue #only add neighbors once
-                for dy in range(-1, 2, 1):
-                    for dx in range(-1, 2, 1):
-                        d_row = row + dy
-                        d_col = col + dx
-                        if not self.game_grid.in_game_grid(d_row, d_col) or (d_row == row and d_col == col): continue
-                        my_tile.neighbors.append(grid[d_row][d_col])
-
-
-    """
-    Find all deterministic actions to take on the board.
-
-    Does not modify state.
-    Returns a list of (source_tile, (action, acted_tile))
-    Source_tile is included for animation purposes.
-    """
-    def search_for_determinism(self, solver_grid:list[list[Solver_Tile]], render = False):
-        actions = []
-        for row in range(len(solver_grid)):
-            for col in range(len(solver_grid[row])):
-                tile = solver_grid[row][col]
-                tile_actions = []
-
-                if(tile.covered() or tile.flagged() or tile.adjacent_bombs == 0): 
-                    #actions.append((tile, tile_actions))
-                    continue
-
-                covered_neighbors = tile.get_neighbors_of_state(State.COVERED)
-                flagged_neighbors = tile.get_neighbors_of_state(State.FLAGGED)
-
-                #if all adjacent covered tiles guaranteed to be bombs, flag them
-                if len(covered_neighbors) + len(flagged_neighbors) == tile.adjacent_bombs:
-                    for neighbor in covered_neighbors: tile_actions += [(State.FLAGGED, neighbor)]
-                    
-                #if all adjacent bombs accounted for, reveal unflagged tiles.
-                if len(flagged_neighbors) == tile.adjacent_bombs and len(covered_neighbors) > 0:
-                    for neighbor in covered_neighbors: tile_actions += [(State.REVEALED, neighbor)]
-                if tile_actions: actions.append((tile, tile_actions))
-                
-        return actions
-    
-    """
-    Find all deterministic actions. 
-
-    Does not modify state of solver_grid
-    Returns list of (action, (row, col)).
-    """
-    def run_simulation(self, solver_grid:list[list[Solver_Tile]], combination:list[Solver_Tile], render = False):
-        actions = []
-
-        #make a copy of the board for the sim
-        sim_grid = [[Solver_Tile() for col in range(self.game_grid.size) ] for row in range(self.game_grid.size)]
-        self.extract_state(sim_grid)
-
-        #flag the neighbors 
-        for neighbor in combination:
-            # print(f"    flagging {neighbor.row}, {neighbor.col}")
-            # self.push_overlay(neighbor.row, neighbor.col, (255, 255, 0))
-            sim_grid[neighbor.row][neighbor.col].state = State.FLAGGED
-            actions += [(State.FLAGGED, (neighbor.row, neighbor.col))]
-
-        if not self.is_sat(sim_grid): return "unsat"
-        
-        #search for determinism until no more actions can be taken 
-        while True: 
-            new_actions = self.search_for_determinism(sim_grid)
-            if not new_actions: break
-
-            #unpack the format that search for determinism returns
-            new_actions = [(action, tile) for _, tile_actions in new_actions for action, tile in tile_actions]
-            
-            #apply the actions
-            for action, acted_on_tile in new_actions:
-                        acted_on_tile.state = action
-            if not self.is_sat(sim_grid): 
-                return "unsat"
-
-            #store the performed actions
-            actions += [(action, (tile.row, tile.col)) for action, tile in new_actions]
-        if self.debug: self.render(self.screen, sim_grid, wait_for_click=True)
-
-        return actions
-
-    """
-    Determine if board is internally consistent.
-
-    Returns True/False
-    """
-    def is_sat(self, solver_grid:list[list[Solver_Tile]]):
-        for row in range(len(solver_grid)):
-            for col in range(len(solver_grid[row])):
-                tile = solver_grid[row][col]
-
-                if(tile.covered() or tile.flagged() or tile.adjacent_bombs == 0): 
-                    continue
-
-                flagged_neighbors = tile.get_neighbors_of_state(State.FLAGGED)
-                
-                if len(flagged_neighbors) > tile.adjacent_bombs:
-                    return False
-                
-                if len(flagged_neighbors) < tile.adjacent_bombs and len(tile.get_neighbors_of_state(State.COVERED)) == 0:
-                    return False
-        return True
-
-    """
-    Find tiles that have two covered neighbors and one flag unaccounted for.
-
-    Returns list of (SolverTile).
-    """
-    def find_50_50_tiles(self, solver_grid:list[list[Solver_Tile]]) -> list[Solver_Tile]:
-        tiles = []
-        for row in range(len(solver_grid)):
-            for col in range(len(solver_grid[row])):
-                tile = solver_grid[row][col]
-
-                if(tile.covered() or tile.flagged() or tile.adjacent_bombs == 0): 
-                    continue
-
-                flagged_neighbors = tile.get_neighbors_of_state(State.FLAGGED)
-                covered_neighbors = tile.get_neighbors_of_state(State.COVERED)
-                if (tile.adjacent_bombs - len(flagged_neighbors)) == 1 and len(covered_neighbors) == 2:
-                    tiles.append(tile)
-        return tiles
-    
-    """
-    Find all unsolved tiles.
-
-    Returns list of (SolverTile).
-    """
-    def find_unsolved(self, solver_grid:list[list[Solver_Tile]]) -> list[Solver_Tile]:
-        tiles = []
-        for row in range(len(solver_grid)):
-            for col in range(len(solver_grid[row])):
-                tile = solver_grid[row][col]
-
-                if(tile.covered() or tile.flagged() or tile.adjacent_bombs == 0): 
-                    continue
-
-                flagged_neighbors = tile.get_neighbors_of_state(State.FLAGGED)
-                covered_neighbors = tile.get_neighbors_of_state(State.COVERED)
-                if (tile.adjacent_bombs - len(flagged_neighbors)) >=1:
-                    tiles.append(tile)
-        return tiles
-
-    """
-    Appliy search_for_determinism() until no more actions can be taken. 
-
-    Modifies game_grid if passed in
-    returns whether a change was made (always False)
-    """
-    def solve_all_determinism(self, screen, solver_grid, game_grid=None): 
-        change_made = True
-        while change_made:
-            change_made = False
-            
-            tile_action_pairs = self.search_for_determinism(solver_grid)
-            for tile, actions in tile_action_pairs:
-                if len(actions) == 0: 
-                    self.clear_overlays()
-                    continue
-
-                for action, acted_on_tile in actions:
-                    change_made = True
-                    acted_on_tile.state = action
-                    if game_grid != None: 
-                        if action == State.FLAGGED:
-                            game_grid.flag_tile(acted_on_tile.row, acted_on_tile.col, True)
-                            #self.push_and_render_overlay(acted_on_tile.row, acted_on_tile.col, (255, 0, 0), 50)
-                        if action == State.REVEALED:
-                            game_grid.uncover_tile(acted_on_tile.row, acted_on_tile.col)
-                            #self.push_and_render_overlay(acted_on_tile.row, acted_on_tile.col, (0, 255, 0), 50)
-                
-                self.clear_overlays()
-            self.extract_state(solver_grid)
-        self.render(screen, solver_grid, 10)
-
-        return change_made
-
-    """
-    Find actions invariant to choice of flags for unsolved tile.
-
-    Returns list of actions in (action, (row, col)) format
-    """
-    def find_guaranteed_actions(self, screen, solver_grid, source_tile):
-        covered_tiles = source_tile.get_neighbors_of_state(State.COVERED)
-        flagged_neighbors = source_tile.get_neighbors_of_state(State.FLAGGED)
-        num_unflagged = (source_tile.adjacent_bombs - len(flagged_neighbors))
-
-        guaranteed_actions = set()
-        first = True
-
-        for combination in combinations(covered_tiles, num_unflagged):
-            #run sim with choice of flagged neighbors
-            actions = self.run_simulation(solver_grid, combination)
-
-            #if unfeasable choice, continue
-            if actions == "unsat": 
-                print("found unsat configuration")
-                # self.wait_for_input(screen, self.tiles)
-                continue
-
-            #else, add to the set structure
-            actions_set = set(actions)
-            # print(f"actions: {[(action, tile) for action, tile in actions]}")
-            if first: 
-                guaranteed_actions = actions_set
-                first = False
-            else: guaranteed_actions = actions_set & guaranteed_actions
-            print(guaranteed_actions)
-
-        #convert the guaranteed actions into grid coordinates
-        guaranteed_actions = [(action, solver_grid[row][col]) for action, (row, col) in guaranteed_actions]
-        print(f"    guaranteed actions  : {[(action, (tile.row, tile.col)) for action, tile in guaranteed_actions]}")
-
-        return guaranteed_actions 
-    
-    def apply_action(self, game_grid, action, row, col):
-        if action == State.FLAGGED:
-            game_grid.flag_tile(row, col, True)
-        if action == State.REVEALED:
-            game_grid.uncover_tile(row, col)
-        
-    def run_iteration(self, game_grid, screen, slow=False, start_tile=None):
-        actions = self.search_for_determinism(self.tiles) 
-        if actions != []:
-            print("iterating...")
-            for source_tile, list_of_actions in actions: 
-                first_actionable = True                
-                for action, tile in list_of_actions:
-                    if slow: self.apply_action(game_grid, action, tile.row, tile.col)
-                    else:
-                        #determine if this action is a repeat
-                        actionable = game_grid.tiles[tile.row][tile.col].covered and not game_grid.tiles[tile.row][tile.col].flagged
-                        if actionable:
-                            if first_actionable: 
-                                first_actionable = False
-                                self.push_and_render_overlay(screen, self.tiles, source_tile.row, source_tile.col, (255, 0, 0), 200)
-
-                            self.push_overlay(tile.row, tile.col, (0, 255, 0))
-                            self.apply_action(game_grid, action, tile.row, tile.col)
-                        self.render(screen, self.tiles, 300)  
-                    
-                        self.clear_overlays()
-            self.extract_state(self.tiles)
-            return
-
-        game_state = game_grid.dump()
-        source_tiles = [self.tiles[start_tile[0]][start_tile[1]]] if start_tile else self.find_unsolved(self.tiles)
-        for source_tile in source_tiles:
-            if(self.debug): self.push_and_render_overlay(screen, self.tiles, source_tile.row, source_tile.col, (255, 255, 0), 0)
-            actions = self.find_guaranteed_actions(screen, self.tiles, source_tile)
-            if actions != []: 
-                self.push_and_render_overlay(screen, self.tiles, source_tile.row, source_tile.col, (255, 255, 0), 400)
-                for action, tile in actions:
-                    self.push_overlay(tile.row, tile.col, (0, 255, 0))
-                    self.apply_action(game_grid, action, tile.row, tile.col)
-                self.render(screen, self.tiles, 500)
-                self.extract_state(self.tiles)
-
-                if self.debug: return
-                tiles_revealed = [tile for action, tile in actions if action == State.REVEALED]
-                if ["x" for tile in tiles_revealed if game_grid.tiles[tile.row][tile.col].has_bomb]:
-                    filename = "logs/%03d.txt" % (len(os.listdir('logs')))
-                    with open(filename, 'w') as f:
-                        f.write(str(game_grid.size) + "\n")
-                        f.write(str(game_grid.bombs) + "\n")
-                        f.write(f"({source_tile.row}, {source_tile.col})\n")
-                        f.write(str(game_state))
-                return
-        
-
-
-# note to self: make an action queue for game_grid object that takes in either debug actions or game actions
-# note to self: maybe pull out applying actions into separate subroutine
-    def launch(self, game_grid, screen): 
-        iters = 0
-        solved = False
-        change_made = False
-        while not solved:
-            # take the easy actions
-            change_made = self.solve_all_determinism(screen, self.tiles, game_grid)
-
-            #find actions that don't depend on choice of flags 
-            potential_tiles = self.find_unsolved(self.tiles)
-            for tile in potential_tiles:
-                print(f"looking at actions for tile ({tile.row}, {tile.col}):")
-                self.push_overlay(tile.row, tile.col, (255, 0, 0))
-                self.wait_for_input(screen, self.tiles)
-
-                guaranteed_actions = self.find_guaranteed_actions(screen, self.tiles, tile)
-                self.clear_overlays()
-
-                if len(guaranteed_actions) == 0: 
-                    print(f"no guaranteed actions for tile ({tile.row}, {tile.col})")
-                    continue
-
-                change_made = True
-                # print("running guaranteed actions...")
-                # print("intersect:")
-                # for action, tile in guaranteed_actions:
-                #     print("  ", action, f"({tile.row}, {tile.col})")
-
-                for action, acted_on_tile in guaranteed_actions:
-                    acted_on_tile.state = action
-                    if action == State.FLAGGED:
-                        game_grid.flag_tile(acted_on_tile.row, acted_on_tile.col, True)
-                        # self.push_and_render_overlay(screen, self.tiles, acted_on_tile.row, acted_on_tile.col, (255, 0, 0), 1000)
-                        self.push_overlay(acted_on_tile.row, acted_on_tile.col, (255, 0, 0))
-                    if action == State.REVEALED:
-                        game_grid.uncover_tile(acted_on_tile.row, acted_on_tile.col)
-                        # self.push_and_render_overlay(screen, self.tiles, acted_on_tile.row, acted_on_tile.col, (0, 255, 0), 1000)
-                        self.push_overlay(acted_on_tile.row, acted_on_tile.col, (0, 255, 0))
-
-                    self.render(screen, self.tiles, 100)
-                self.extract_state(self.tiles)
-                break
-            if not change_made:
-                solved = True
-                    
-
-
-    def push_overlay(self, row, col, color, delay=0):
-        self.overlays.append(self.Overlay(row, col, color, delay))
-
-    def pop_overlay(self):
-        self.overlays.pop()
-
-    def push_and_render_overlay(self, screen, solver_grid, row, col, color, delay):
-        self.overlays.append(self.Overlay(row, col, color))
-        self.draw(screen, solver_grid)
-        self.render(screen, solver_grid, delay)
-
-    def clear_overlays(self):
-        self.overlays = []
-
-    def draw(self, screen, solver_grid=None):
-        self.screen.fill((255, 255, 255))
-        self.game_grid.draw(self.screen)
-        dsize = self.game_grid.tile_draw_size
-
-        for overlay in self.overlays:
-            offset = 2
-            rect = (overlay.col * dsize + offset, overlay.row * dsize + offset, dsize - offset * 2, dsize - offset * 2)
-            pygame.draw.rect(screen, overlay.color, rect, width=2)
-            pygame.display.update()
-            pygame.time.wait(overlay.delay)
-
-        # if solver_grid==None: return 
-        if self.debug:
-            for row in range(self.game_grid.size):
-                for col in range(self.game_grid.size):
-                    tile = solver_grid[row][col]
-                    text_surface = self.font.render(".", True, (100, 0, 0))
-                    if tile.flagged(): 
-                        text_surface = self.font.render("f", True, (100, 0, 0))
-                        # surface_w, surface_h = text_surface.get_size() 
-                    elif tile.revealed(): 
-                        text_surface = self.font.render("r", True, (0, 100, 0))
-                    self.screen.blit(text_surface, (col * dsize, row * dsize))
-
-    def render(self, screen, solver_grid, wait_time=0, wait_for_click=False):
-        self.draw(screen, solver_grid)
-        pygame.display.flip()
-        pygame.time.wait(wait_time)
-        while(wait_for_click): 
-            for event in pygame.event.get(): 
-                if event.type == pygame.KEYDOWN: wait_for_click = False
-    
-    def wait_for_input(self, screen, solver_grid, clear_overlays = False):
-        reee = True
-        self.render(screen, solver_grid)
-        while (reee):
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_g:
-                    reee = False
-                    if clear_overlays: self.clear_overlays()
-
-
-        
+from itertools import combinations
+from math import comb
+import time
+from game_emulation import State, Game_grid
+from frontier_components import build_constraints, subset_reduction, split_components
+from mine_probability import Mine_probabilities, mine_probabilities
+from pattern_cache import Pattern_cache, shared_cache
+from solver_metrics import Solver_metrics
+from position_log import FAILURE_LOG, Position, Position_log_writer
+from parallel_search import find_guaranteed_actions_parallel
+from solver_budget import TIERS, Hint, Solver_budget
+
+# extract_state's lookup from covered + 2 * flagged to State
+_STATE_OF_KEY = bytes([State.REVEALED, State.COVERED, State.FLAGGED, State.FLAGGED]) + bytes(252)
+# State to 1 for the state counted, 0 otherwise
+_IS_COVERED = bytes([1, 0, 0]) + bytes(253)
+_IS_FLAGGED = bytes([0, 1, 0]) + bytes(253)
+
+
+class Solver_observer:
+    """
+    Receives the solver's progress for display.
+
+    The base observer does nothing, so a solver built without one runs headless:
+    no display, no fonts, no delays and no event loop.
+    """
+    def push_overlay(self, row, col, color, delay=0):
+        pass
+
+    def push_and_render_overlay(self, solver_grid, row, col, color, delay):
+        pass
+
+    def clear_overlays(self):
+        pass
+
+    def render(self, solver_grid, wait_time=0, wait_for_click=False):
+        pass
+
+    def wait_for_input(self, solver_grid, clear_overlays=False):
+        pass
+
+    def log(self, message):
+        pass
+
+
+class Solve_result:
+    def __init__(self, actions, won, lost, guesses=0, tier=None, complete=True) -> None:
+        self.actions = actions
+        self.won = won
+        self.lost = lost
+        self.guesses = guesses
+        # deepest tier the solver needed, and False if a budget stopped it before the game was over
+        self.tier = tier
+        self.complete = complete
+
+
+class Solver:
+    # components with more covered cells than this are left to the per-tile simulation tier
+    max_component_cells = 40
+    # stuck positions with fewer flag combinations than this are simulated here even when there is a pool
+    min_parallel_combinations = 64
+
+    def __init__(self, game_grid:Game_grid, observer:Solver_observer=None, debug=False,
+                 metrics:Solver_metrics=None, pattern_cache:Pattern_cache=None, action_queue=None, pool=None) -> None:
+        self.observer = observer if observer is not None else Solver_observer()
+        # timings and counters are only recorded when a Solver_metrics is passed in
+        self.metrics = metrics
+        self.game_grid = game_grid
+        # First move always in the center
+        if not game_grid.game_started:
+            game_grid.uncover_tile(game_grid.size //2 , game_grid.size // 2)
+        self.size = game_grid.size
+        # the solver reads cell contents straight from the game's arrays and only keeps its own
+        # State per cell, since simulations change that state hypothetically
+        self.neighbors = game_grid.neighbors
+        self.adjacent_bombs = game_grid.adjacent_bombs
+        self.tiles = self.extract_state()
+        # number of COVERED and FLAGGED neighbors of each cell in self.tiles, kept up to date by set_tile
+        self.covered_counts, self.flagged_counts = self.count_neighbor_states()
+        # cells the game changed since the last sync_state, from Game_grid.apply_actions
+        self.journal = []
+        # frontier: numbered cells revealed in the game that still have covered neighbors in self.tiles
+        # dirty: frontier cells next to a change that search_for_determinism hasn't looked at since
+        self.frontier = set()
+        self.dirty = set()
+        self.update_frontier(self.constraint_cells())
+        self.actions = []
+        self.guesses = 0
+        # enumerations of components seen before, in this game or any other game in the process
+        self.pattern_cache = pattern_cache if pattern_cache is not None else shared_cache
+        self.debug = debug
+        # every action taken is also put on this queue as (source, action, row, col), for a display on another thread
+        # source is the (row, col) of the tile the action was deduced from, or None when it came from a whole-frontier tier
+        self.action_queue = action_queue
+        # process pool to run the guaranteed-action simulations of many source tiles on, if given
+        self.pool = pool
+        # Solver_budget the current launch or hint must finish within, if any
+        self.budget = None
+        self.tier_reached = None
+
+    def record_tier_time(self, tier, start):
+        if self.metrics is None: return
+        self.metrics.add_time(tier, time.perf_counter() - start)
+
+    """Note that tier produced moves, for Solve_result.tier."""
+    def reach_tier(self, tier):
+        if self.tier_reached is None or TIERS.index(tier) > TIERS.index(self.tier_reached): self.tier_reached = tier
+
+    def out_of_budget(self) -> bool:
+        return self.budget is not None and self.budget.exhausted()
+
+    """
+    Extract state from the game emulator into a new solver grid: one State value per cell id.
+    covered + 2 * flagged is summed as big integers, a byte per cell, then looked up with one translate.
+    """
+    def extract_state(self) -> bytearray:
+        if self.metrics is not None: self.metrics.count("extract_state")
+        covered = self.game_grid.covered
+        flagged = self.game_grid.flagged
+        keys = int.from_bytes(covered, "little") + 2 * int.from_bytes(flagged, "little")
+        return bytearray(keys.to_bytes(len(covered), "little").translate(_STATE_OF_KEY))
+
+    def count_neighbor_states(self):
+        table = self.game_grid.neighbor_table
+        covered_counts = table.count_around(self.tiles.translate(_IS_COVERED))
+        flagged_counts = table.count_around(self.tiles.translate(_IS_FLAGGED))
+        return covered_counts, flagged_counts
+
+    """
+    Change the state of one cell in self.tiles and the neighbor counts around it.
+    Every write to self.tiles goes through here so the counts stay right.
+    """
+    def set_tile(self, cell, state):
+        tiles = self.tiles
+        old_state = tiles[cell]
+        if old_state == state: return
+        tiles[cell] = state
+        deltas = self.neighbors.deltas[self.neighbors.kinds[cell]]
+        if old_state == State.COVERED:
+            counts = self.covered_counts
+            for delta in deltas: counts[cell + delta] -= 1
+        elif old_state == State.FLAGGED:
+            counts = self.flagged_counts
+            for delta in deltas: counts[cell + delta] -= 1
+        if state == State.COVERED:
+            counts = self.covered_counts
+            for delta in deltas: counts[cell + delta] += 1
+        elif state == State.FLAGGED:
+            counts = self.flagged_counts
+            for delta in deltas: counts[cell + delta] += 1
+
+    """
+    Find cells whose number constrains their neighbors: revealed in the game and not zero.
+
+    Cells revealed only inside a simulation don't count, their number is unknown to the solver.
+    """
+    def constraint_cells(self):
+        covered = self.game_grid.covered
+        adjacent_bombs = self.adjacent_bombs
+        return [index for index in range(len(covered)) if not covered[index] and adjacent_bombs[index]]
+
+    """Find the constraint cells among the given cells and their neighbors."""
+    def constraint_neighbors(self, cells) -> set[int]:
+        covered = self.game_grid.covered
+        adjacent_bombs = self.adjacent_bombs
+        deltas = self.neighbors.deltas
+        kinds = self.neighbors.kinds
+        found = set()
+        for cell in cells:
+            for delta in deltas[kinds[cell]]:
+                if not covered[cell + delta] and adjacent_bombs[cell + delta]: found.add(cell + delta)
+            if not covered[cell] and adjacent_bombs[cell]: found.add(cell)
+        return found
+
+    """
+    Re-examine the frontier around changed cells.
+
+    Constraint cells next to a change join the frontier and the dirty worklist while they
+    still have covered neighbors, and leave the frontier once they don't.
+    """
+    def update_frontier(self, changed_cells):
+        covered_counts = self.covered_counts
+        for cell in self.constraint_neighbors(changed_cells):
+            if covered_counts[cell]:
+                self.frontier.add(cell)
+                self.dirty.add(cell)
+            else:
+                self.frontier.discard(cell)
+                self.dirty.discard(cell)
+
+    """
+    Bring the solver grid up to date with the cells in the journal of game changes, and update the
+    frontier around every cell that changed.
+
+    acted_cells are cells the solver already set in self.tiles before applying them to the game.
+    Only changes made through apply_actions are seen, so the game must not be changed behind the solver's back.
+    """
+    def sync_state(self, acted_cells=()):
+        covered = self.game_grid.covered
+        flagged = self.game_grid.flagged
+        changed = set(acted_cells)
+        for cell in self.journal:
+            self.set_tile(cell, State.FLAGGED if flagged[cell] else State.COVERED if covered[cell] else State.REVEALED)
+            changed.add(cell)
+        self.journal = []
+        self.update_frontier(changed)
+
+    def neighbors_of_state(self, solver_grid:bytearray, index, state):
+        deltas = self.neighbors.deltas[self.neighbors.kinds[index]]
+        return [index + delta for delta in deltas if solver_grid[index + delta] == state]
+
+    """
+    Find all deterministic actions to take on the board.
+
+    Only looks at the given constraint cells, the whole frontier by default.
+    Does not modify state.
+    Returns a list of (source_cell, [(action, acted_cell)])
+    Source_cell is included for animation purposes.
+    """
+    def search_for_determinism(self, solver_grid:bytearray, cells=None, render = False):
+        actions = []
+        covered_counts = self.covered_counts
+        flagged_counts = self.flagged_counts
+        for index in (sorted(self.frontier) if cells is None else cells):
+            num_covered = covered_counts[index]
+            if not num_covered: continue
+            adjacent_bombs = self.adjacent_bombs[index]
+            num_flagged = flagged_counts[index]
+
+            #if all adjacent covered tiles guaranteed to be bombs, flag them
+            if num_covered + num_flagged == adjacent_bombs:
+                action = State.FLAGGED
+            #if all adjacent bombs accounted for, reveal unflagged tiles.
+            elif num_flagged == adjacent_bombs:
+                action = State.REVEALED
+            else: continue
+            actions.append((index, [(action, neighbor) for neighbor in self.neighbors_of_state(solver_grid, index, State.COVERED)]))
+                
+        return actions
+    
+    """
+    Find all deterministic actions. 
+
+    Runs in place on solver_grid and records every change on a trail, which is rolled back
+    before returning, so solver_grid is left as it was passed in.
+    Returns list of (action, cell).
+    """
+    def run_simulation(self, solver_grid:bytearray, combination:list[int], render = False):
+        actions = []
+        trail = []
+        try:
+            #flag the neighbors 
+            for neighbor in combination:
+                trail.append((neighbor, solver_grid[neighbor]))
+                self.set_tile(neighbor, State.FLAGGED)
+                actions += [(State.FLAGGED, neighbor)]
+
+            #only cells next to a change can become unsat or gain new actions
+            worklist = self.constraint_neighbors(combination)
+            if not self.is_sat(solver_grid, worklist): return "unsat"
+            
+            #search for determinism until no more actions can be taken 
+            while True: 
+                new_actions = self.search_for_determinism(solver_grid, worklist)
+                if not new_actions: break
+
+                #unpack the format that search for determinism returns
+                new_actions = [(action, cell) for _, tile_actions in new_actions for action, cell in tile_actions]
+                
+                #apply the actions
+                for action, acted_on_cell in new_actions:
+                    trail.append((acted_on_cell, solver_grid[acted_on_cell]))
+                    self.set_tile(acted_on_cell, action)
+                worklist = self.constraint_neighbors([cell for _, cell in new_actions])
+                if not self.is_sat(solver_grid, worklist): 
+                    return "unsat"
+
+                #store the performed actions
+                actions += new_actions
+            if self.debug: self.observer.render(solver_grid, wait_for_click=True)
+
+            return actions
+        finally:
+            self.undo(solver_grid, trail)
+
+    """Roll back the changes recorded on a trail, newest first."""
+    def undo(self, solver_grid:bytearray, trail):
+        for cell, state in reversed(trail):
+            self.set_tile(cell, state)
+
+    """
+    Determine if board is internally consistent.
+
+    Only checks the given constraint cells, the whole frontier by default.
+    Returns True/False
+    """
+    def is_sat(self, solver_grid:bytearray, cells=None):
+        if self.metrics is None:
+            return self.find_unsat_cell(solver_grid, cells) is None
+        start = time.perf_counter()
+        sat = self.find_unsat_cell(solver_grid, cells) is None
+        self.metrics.add_time("is_sat", time.perf_counter() - start)
+        return sat
+
+    """
+    Find a constraint cell with too many flags around it, or too few flags and no covered cells left.
+
+    Returns the cell, or None if every given cell is satisfiable.
+    """
+    def find_unsat_cell(self, solver_grid:bytearray, cells=None):
+        covered_counts = self.covered_counts
+        flagged_counts = self.flagged_counts
+        for index in (self.frontier if cells is None else cells):
+            adjacent_bombs = self.adjacent_bombs[index]
+            num_flagged = flagged_counts[index]
+            
+            if num_flagged > adjacent_bombs:
+                return index
+            
+            if num_flagged < adjacent_bombs and covered_counts[index] == 0:
+                return index
+        return None
+
+    """
+    Find tiles that have two covered neighbors and one flag unaccounted for.
+
+    Returns list of cells.
+    """
+    def find_50_50_tiles(self, solver_grid:bytearray) -> list[int]:
+        tiles = []
+        for index in sorted(self.frontier):
+            num_flagged = self.flagged_counts[index]
+            if (self.adjacent_bombs[index] - num_flagged) == 1 and self.covered_counts[index] == 2:
+                tiles.append(index)
+        return tiles
+    
+    """
+    Find all unsolved tiles.
+
+    Returns list of cells.
+    """
+    def find_unsolved(self, solver_grid:bytearray) -> list[int]:
+        tiles = []
+        for index in sorted(self.frontier):
+            num_flagged = self.flagged_counts[index]
+            if (self.adjacent_bombs[index] - num_flagged) >=1:
+                tiles.append(index)
+        return tiles
+
+    """
+    Appliy search_for_determinism() to the dirty frontier cells until no more actions can be taken. 
+
+    Modifies game_grid
+    returns whether a change was made (always False)
+    """
+    def solve_all_determinism(self, game_grid): 
+        change_made = True
+        while change_made:
+            change_made = False
+            if not self.dirty: break
+            
+            dirty = sorted(self.dirty)
+            self.dirty = set()
+            tile_action_pairs = self.search_for_determinism(self.tiles, dirty)
+            acted_cells = []
+            for tile, actions in tile_action_pairs:
+                if len(actions) == 0: 
+                    self.observer.clear_overlays()
+                    continue
+
+                batch = []
+                for action, acted_on_cell in actions:
+                    #another source tile may have asked for the same action this pass
+                    if self.tiles[acted_on_cell] == action: continue
+                    change_made = True
+                    self.set_tile(acted_on_cell, action)
+                    acted_cells.append(acted_on_cell)
+                    batch.append((action, acted_on_cell))
+                if batch: self.apply_actions(game_grid, batch, game_grid.row_col(tile))
+                
+                self.observer.clear_overlays()
+            self.sync_state(acted_cells)
+            if game_grid.lost(): break
+        self.observer.render(self.tiles, 10)
+
+        return change_made
+
+    """
+    Find actions invariant to choice of flags for unsolved tile.
+
+    Returns list of actions in (action, cell) format
+    """
+    def find_guaranteed_actions(self, solver_grid, source_tile):
+        covered_tiles = self.neighbors_of_state(solver_grid, source_tile, State.COVERED)
+        num_unflagged = (self.adjacent_bombs[source_tile] - self.flagged_counts[source_tile])
+
+        guaranteed_actions = set()
+        first = True
+        metrics = self.metrics
+
+        for combination in combinations(covered_tiles, num_unflagged):
+            #an action is only guaranteed once every combination has been tried
+            if self.budget is not None:
+                if self.budget.exhausted(): return []
+                self.budget.spend()
+
+            #run sim with choice of flagged neighbors
+            if metrics is None:
+                actions = self.run_simulation(solver_grid, combination)
+            else:
+                start = time.perf_counter()
+                actions = self.run_simulation(solver_grid, combination)
+                metrics.add_time("simulation", time.perf_counter() - start)
+                metrics.count("combinations")
+
+            #if unfeasable choice, continue
+            if actions == "unsat": 
+                if metrics is not None: metrics.count("unsat")
+                continue
+
+            #else, add to the set structure
+            actions_set = set(actions)
+            if first: 
+                guaranteed_actions = actions_set
+                first = False
+            else: guaranteed_actions = actions_set & guaranteed_actions
+
+        guaranteed_actions = list(guaranteed_actions)
+        if self.debug:
+            self.observer.log(f"    guaranteed actions  : {[(action, self.game_grid.row_col(cell)) for action, cell in guaranteed_actions]}")
+
+        return guaranteed_actions 
+    
+    """
+    Find the guaranteed actions of each of the given source tiles, spread across self.pool.
+
+    Returns {tile: list of (action, cell)}, or None when there is no pool and tiles should be
+    looked at one at a time with find_guaranteed_actions.
+    """
+    def find_guaranteed_actions_by_tile(self, solver_grid, tiles):
+        if self.pool is None or self.budget is not None or len(tiles) < 2: return None
+        # sending the board to the workers costs more than a handful of simulations
+        num_combinations = sum(comb(self.covered_counts[tile], self.adjacent_bombs[tile] - self.flagged_counts[tile]) for tile in tiles)
+        if num_combinations < self.min_parallel_combinations: return None
+        start = time.perf_counter()
+        results, (num_combinations, num_unsat) = find_guaranteed_actions_parallel(self, solver_grid, tiles, self.pool)
+        if self.metrics is not None:
+            self.metrics.add_time("parallel_search", time.perf_counter() - start)
+            self.metrics.count("combinations", num_combinations)
+            self.metrics.count("unsat", num_unsat)
+        return results
+
+    """
+    Compare the constraints of overlapping numbered tiles (see subset_reduction).
+
+    Returns list of actions in (action, cell) format
+    """
+    def find_subset_actions(self, solver_grid):
+        constraints = build_constraints(solver_grid, self.frontier, self.neighbors, self.adjacent_bombs)
+        safe_cells, mine_cells = subset_reduction(constraints)
+        return [(State.REVEALED, cell) for cell in safe_cells] + [(State.FLAGGED, cell) for cell in mine_cells]
+
+    """
+    Split the frontier into independent components and enumerate each one.
+
+    Returns (actions, sources): actions in (action, cell) format that hold in every valid
+    assignment, and the source tiles of components too large to enumerate.
+    """
+    def find_component_actions(self, solver_grid):
+        constraints = build_constraints(solver_grid, self.frontier, self.neighbors, self.adjacent_bombs)
+        actions = []
+        skipped_sources = set()
+        for component in split_components(constraints):
+            if len(component.cells) > self.max_component_cells:
+                skipped_sources.update(constraint.source for constraint in component.constraints)
+                continue
+            #every component's actions are certain on their own, so the ones found so far can be kept
+            if self.budget is not None:
+                if self.budget.exhausted(): break
+                self.budget.spend()
+            enumeration = self.pattern_cache.enumerate(component, self.size, self.budget)
+            if enumeration is None: break
+            actions += [(State.REVEALED, cell) for cell in enumeration.safe_cells()]
+            actions += [(State.FLAGGED, cell) for cell in enumeration.mine_cells()]
+        return actions, skipped_sources
+
+    """
+    Find the probability that each covered cell holds a mine, given the numbers and the bomb count.
+
+    Components too large to enumerate are treated like unconstrained cells, so their probabilities
+    are an approximation.
+    Returns Mine_probabilities, or None if the budget ran out first.
+    """
+    def find_mine_probabilities(self, solver_grid) -> Mine_probabilities:
+        constraints = build_constraints(solver_grid, self.frontier, self.neighbors, self.adjacent_bombs)
+        enumerations = []
+        enumerated_cells = set()
+        for component in split_components(constraints):
+            if len(component.cells) > self.max_component_cells: continue
+            if self.budget is not None:
+                if self.budget.exhausted(): return None
+                self.budget.spend()
+            enumeration = self.pattern_cache.enumerate(component, self.size, self.budget)
+            if enumeration is None: return None
+            enumerations.append(enumeration)
+            enumerated_cells.update(component.cells)
+        unconstrained_cells = [
+            cell for cell, state in enumerate(solver_grid) if state == State.COVERED and cell not in enumerated_cells
+        ]
+        mines_left = self.game_grid.bombs - solver_grid.count(State.FLAGGED)
+        return mine_probabilities(enumerations, unconstrained_cells, mines_left)
+
+    def apply_action(self, game_grid, action, row, col, source=None):
+        self.apply_actions(game_grid, [(action, game_grid.index(row, col))], source)
+
+    """
+    Play a batch of (action, cell) pairs in the game in one call, and keep the journal of cells it
+    changed for the next sync_state.
+    """
+    def apply_actions(self, game_grid, actions, source=None):
+        row_col = game_grid.row_col
+        for action, cell in actions:
+            row, col = row_col(cell)
+            self.actions.append((action, row, col))
+            if self.action_queue is not None: self.action_queue.put((source, action, row, col))
+        if self.metrics is not None: self.metrics.count("actions", len(actions))
+        self.journal.extend(game_grid.apply_actions(actions))
+        
+    def run_iteration(self, game_grid, slow=False, start_tile=None):
+        row_col = game_grid.row_col
+        actions = self.search_for_determinism(self.tiles) 
+        if actions != []:
+            self.observer.log("iterating...")
+            for source_tile, list_of_actions in actions: 
+                first_actionable = True                
+                for action, cell in list_of_actions:
+                    if slow: self.apply_action(game_grid, action, *row_col(cell), row_col(source_tile))
+                    else:
+                        #determine if this action is a repeat
+                        actionable = game_grid.covered[cell] and not game_grid.flagged[cell]
+                        if actionable:
+                            if first_actionable: 
+                                first_actionable = False
+                                self.observer.push_and_render_overlay(self.tiles, *row_col(source_tile), (255, 0, 0), 200)
+
+                            self.observer.push_overlay(*row_col(cell), (0, 255, 0))
+                            self.apply_action(game_grid, action, *row_col(cell), row_col(source_tile))
+                        self.observer.render(self.tiles, 300)  
+                    
+                        self.observer.clear_overlays()
+            self.sync_state()
+            return
+
+        position = Position.from_game_grid(game_grid)
+        source_tiles = [game_grid.index(*start_tile)] if start_tile else self.find_unsolved(self.tiles)
+        actions_by_tile = self.find_guaranteed_actions_by_tile(self.tiles, source_tiles)
+        for source_tile in source_tiles:
+            if(self.debug): self.observer.push_and_render_overlay(self.tiles, *row_col(source_tile), (255, 255, 0), 0)
+            if actions_by_tile is not None: actions = actions_by_tile[source_tile]
+            else: actions = self.find_guaranteed_actions(self.tiles, source_tile)
+            if actions != []: 
+                self.observer.push_and_render_overlay(self.tiles, *row_col(source_tile), (255, 255, 0), 400)
+                for action, cell in actions:
+                    self.observer.push_overlay(*row_col(cell), (0, 255, 0))
+                    self.apply_action(game_grid, action, *row_col(cell), row_col(source_tile))
+                self.observer.render(self.tiles, 500)
+                self.sync_state()
+
+                if self.debug: return
+                cells_revealed = [cell for action, cell in actions if action == State.REVEALED]
+                if ["x" for cell in cells_revealed if game_grid.has_bomb[cell]]:
+                    position.last_tile = row_col(source_tile)
+                    position.moves = actions
+                    with Position_log_writer(FAILURE_LOG) as log:
+                        log.write(position)
+                return
+
+        #nothing is certain from the numbers alone: use the bomb count, then take the safest guess
+        probabilities = self.find_mine_probabilities(self.tiles)
+        certain_actions = probabilities.certain_actions()
+        if certain_actions:
+            for action, cell in certain_actions:
+                self.observer.push_overlay(*row_col(cell), (0, 255, 0))
+                self.apply_action(game_grid, action, *row_col(cell))
+            self.observer.render(self.tiles, 500)
+            self.sync_state()
+            return
+        best = probabilities.best_guess()
+        if best is None: return
+        cell, probability = best
+        self.observer.log(f"guessing {row_col(cell)} with mine probability {probability:.3f}")
+        self.observer.push_and_render_overlay(self.tiles, *row_col(cell), (0, 0, 255), 400)
+        self.guesses += 1
+        if self.metrics is not None: self.metrics.count("guesses")
+        self.apply_action(game_grid, State.REVEALED, *row_col(cell))
+        self.observer.render(self.tiles, 500)
+        self.sync_state()
+        
+
+    """
+    Play until the game is over, or until nothing certain is left when guess is False.
+
+    With a Solver_budget, stops once it runs out, keeping only moves that were certain.
+    """
+    def launch(self, game_grid, guess=True, budget=None): 
+        self.budget = budget
+        while not game_grid.lost() and not game_grid.won():
+            if self.out_of_budget(): break
+            # take the easy actions
+            start = time.perf_counter()
+            num_actions = len(self.actions)
+            change_made = self.solve_all_determinism(game_grid)
+            self.record_tier_time("determinism", start)
+            if len(self.actions) > num_actions: self.reach_tier("determinism")
+            if game_grid.lost() or game_grid.won(): break
+
+            #compare overlapping constraints before enumerating anything
+            start = time.perf_counter()
+            subset_actions = self.find_subset_actions(self.tiles)
+            self.record_tier_time("subset", start)
+            if subset_actions:
+                self.reach_tier("subset")
+                self.take_actions(game_grid, subset_actions)
+                continue
+
+            #enumerate the frontier one independent component at a time
+            start = time.perf_counter()
+            component_actions, skipped_sources = self.find_component_actions(self.tiles)
+            self.record_tier_time("components", start)
+            if component_actions:
+                self.reach_tier("components")
+                self.take_actions(game_grid, component_actions)
+                continue
+
+            #find actions that don't depend on choice of flags, around components too large to enumerate
+            potential_tiles = [tile for tile in self.find_unsolved(self.tiles) if tile in skipped_sources]
+            start = time.perf_counter()
+            actions_by_tile = self.find_guaranteed_actions_by_tile(self.tiles, potential_tiles)
+            if actions_by_tile is not None: self.record_tier_time("guaranteed_actions", start)
+            for tile in potential_tiles:
+                row, col = game_grid.row_col(tile)
+                self.observer.log(f"looking at actions for tile ({row}, {col}):")
+                self.observer.push_overlay(row, col, (255, 0, 0))
+                self.observer.wait_for_input(self.tiles)
+
+                if actions_by_tile is not None: guaranteed_actions = actions_by_tile[tile]
+                else:
+                    start = time.perf_counter()
+                    guaranteed_actions = self.find_guaranteed_actions(self.tiles, tile)
+                    self.record_tier_time("guaranteed_actions", start)
+                self.observer.clear_overlays()
+
+                if len(guaranteed_actions) == 0: 
+                    self.observer.log(f"no guaranteed actions for tile ({row}, {col})")
+                    continue
+
+                change_made = True
+                self.reach_tier("guaranteed_actions")
+                self.take_actions(game_grid, guaranteed_actions, (row, col))
+                break
+            if change_made: continue
+            if not guess: break
+
+            #no certain move from the numbers alone: weigh in the bomb count, then take the safest guess
+            start = time.perf_counter()
+            probabilities = self.find_mine_probabilities(self.tiles)
+            self.record_tier_time("probability", start)
+            if probabilities is None: break
+            certain_actions = probabilities.certain_actions()
+            if certain_actions:
+                self.reach_tier("probability")
+                self.take_actions(game_grid, certain_actions)
+                continue
+            best = probabilities.best_guess()
+            if best is None: break
+            self.reach_tier("guess")
+            self.guesses += 1
+            if self.metrics is not None: self.metrics.count("guesses")
+            self.take_actions(game_grid, [(State.REVEALED, best[0])])
+
+    """
+    Find the next moves without playing them, within an optional Solver_budget.
+
+    Tries the tiers from cheapest to deepest and returns the first certain moves found. When nothing
+    is certain, returns the least likely mine, or a quick estimate of it if the budget ran out first.
+    Returns a Hint.
+    """
+    def hint(self, budget=None) -> Hint:
+        self.budget = budget
+        try:
+            tiles = self.tiles
+            actions = {}
+            for _, tile_actions in self.search_for_determinism(tiles):
+                for action, cell in tile_actions: actions[cell] = action
+            if actions: return Hint([(action, cell) for cell, action in actions.items()], "determinism", True)
+
+            actions = self.find_subset_actions(tiles)
+            if actions: return Hint(actions, "subset", True)
+            if self.out_of_budget(): return self.quick_guess()
+
+            actions, skipped_sources = self.find_component_actions(tiles)
+            if actions: return Hint(actions, "components", not self.out_of_budget())
+
+            for tile in self.find_unsolved(tiles):
+                if self.out_of_budget(): return self.quick_guess()
+                if tile not in skipped_sources: continue
+                actions = self.find_guaranteed_actions(tiles, tile)
+                if actions: return Hint(actions, "guaranteed_actions", True)
+
+            probabilities = self.find_mine_probabilities(tiles)
+            if probabilities is None: return self.quick_guess()
+            actions = probabilities.certain_actions()
+            if actions: return Hint(actions, "probability", True)
+            best = probabilities.best_guess()
+            return Hint([(State.REVEALED, best[0])] if best else [], "guess", True)
+        finally:
+            self.budget = None
+
+    """
+    Estimate each covered cell's mine probability from its most pessimistic neighboring number alone,
+    or the overall density of the remaining mines away from the frontier, and pick the lowest.
+    Costs one pass over the frontier, for when the budget has run out.
+    Returns a Hint.
+    """
+    def quick_guess(self) -> Hint:
+        tiles = self.tiles
+        num_covered = tiles.count(State.COVERED)
+        if not num_covered: return Hint([], "quick_guess", False)
+        mines_left = self.game_grid.bombs - tiles.count(State.FLAGGED)
+        estimates = {}
+        for source in self.frontier:
+            num_around = self.covered_counts[source]
+            if not num_around: continue
+            estimate = (self.adjacent_bombs[source] - self.flagged_counts[source]) / num_around
+            for neighbor in self.neighbors_of_state(tiles, source, State.COVERED):
+                estimates[neighbor] = max(estimates.get(neighbor, 0.0), estimate)
+        density = mines_left / num_covered
+        best = min(
+            (estimates.get(cell, density), cell) for cell, state in enumerate(tiles) if state == State.COVERED
+        )
+        return Hint([(State.REVEALED, best[1])], "quick_guess", False)
+
+    def take_actions(self, game_grid, actions, source=None):
+        for action, acted_on_cell in actions:
+            self.set_tile(acted_on_cell, action)
+        self.apply_actions(game_grid, actions, source)
+        for action, acted_on_cell in actions:
+            color = (255, 0, 0) if action == State.FLAGGED else (0, 255, 0)
+            self.observer.push_overlay(*game_grid.row_col(acted_on_cell), color)
+
+            self.observer.render(self.tiles, 100)
+        self.sync_state([cell for _, cell in actions])
+
+
+"""
+Solve a game without any display.
+
+Runs the deterministic, subset reduction, component enumeration and guaranteed-action tiers until none makes progress,
+then uses the bomb count and, if guess is set, reveals the cell least likely to hold a mine.
+Returns a Solve_result with the actions taken and the final game state.
+If metrics is given, the solver records its timings and counters into it.
+With a process pool, the guaranteed-action simulations of all stuck source tiles run on it at once.
+With a Solver_budget, stops when it runs out; the result's tier is the deepest tier that produced moves.
+"""
+def solve(game_grid:Game_grid, debug=False, metrics:Solver_metrics=None, guess=True, solver_class=None, pool=None,
+          budget:Solver_budget=None) -> Solve_result:
+    solver = (solver_class or Solver)(game_grid, debug=debug, metrics=metrics, pool=pool)
+    solver.launch(game_grid, guess=guess, budget=budget)
+    complete = game_grid.won() or game_grid.lost() or budget is None or not budget.exhausted()
+    return Solve_result(solver.actions, game_grid.won(), game_grid.lost(), solver.guesses, solver.tier_reached, complete)
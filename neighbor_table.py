@@ -0,0 +1,80 @@
+import weakref
+
+
+class Neighbor_table:
+    """
+    The cells around every cell of a size x size board, computed once per board size.
+
+    A cell's neighbors depend only on whether it is on the first, a middle or the last row and column,
+    so the table stores one byte per cell, kinds[cell], picking one of nine tuples of cell id offsets in
+    deltas. The neighbors of cell c are c + delta for delta in deltas[kinds[c]], which hot loops compute
+    inline. Tables are immutable and shared by every grid, solver and simulation of that size.
+    """
+    def __init__(self, size) -> None:
+        self.size = size
+        self.deltas, self.kinds = self.build(size)
+        # built by the first count_around
+        self.column_masks = None
+
+    @staticmethod
+    def build(size):
+        # for the first, middle and last row or column
+        steps = ((0, 1), (-1, 0, 1), (-1, 0))
+        # kind 3 * row position + column position; kind 9 is the only cell of a 1 x 1 board
+        deltas = tuple(
+            tuple(dy * size + dx for dy in dys for dx in dxs if dy or dx) for dys in steps for dxs in steps
+        ) + ((),)
+        if size == 1: return deltas, bytearray([9])
+
+        def row(first_kind):
+            return bytes([first_kind]) + bytes([first_kind + 1]) * (size - 2) + bytes([first_kind + 2])
+        kinds = bytearray(row(0) + row(3) * (size - 2) + row(6))
+        return deltas, kinds
+
+    """
+    Count, for every cell, the neighbors whose byte in indicators is 1 (every byte must be 0 or 1).
+
+    Works on the whole board at once: indicators is read as one big integer with a byte per cell, and the eight
+    neighbor directions are eight shifts of it, with the cells that would wrap round a row edge masked off first.
+    Returns a bytearray of counts.
+    """
+    def count_around(self, indicators) -> bytearray:
+        size = self.size
+        num_cells = size * size
+        full = (1 << 8 * num_cells) - 1
+        if self.column_masks is None:
+            first_col = int.from_bytes(bytes(col != 0 for _ in range(size) for col in range(size)), "little")
+            last_col = int.from_bytes(bytes(col != size - 1 for _ in range(size) for col in range(size)), "little")
+            # the neighbor to the right is never in column 0, and the one to the left never in the last column
+            self.column_masks = {-1: last_col, 0: full, 1: first_col}
+        bits = int.from_bytes(indicators, "little")
+        total = 0
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if not (dy or dx): continue
+                shift = 8 * (dy * size + dx)
+                sources = bits & self.column_masks[dx]
+                total += sources >> shift if shift > 0 else (sources << -shift) & full
+        return bytearray(total.to_bytes(num_cells, "little"))
+
+    """The neighbors of one cell, as a new tuple. Hot loops add the deltas themselves instead."""
+    def __getitem__(self, cell):
+        return tuple(map(cell.__add__, self.deltas[self.kinds[cell]]))
+
+    def __len__(self):
+        return len(self.kinds)
+
+
+# tables in use somewhere, plus the last one asked for, so a run of boards of one size builds it once
+# without keeping every size ever used alive
+_tables = weakref.WeakValueDictionary()
+_last_table = None
+
+
+def neighbor_table(size) -> Neighbor_table:
+    global _last_table
+    table = _tables.get(size)
+    if table is None:
+        table = _tables[size] = Neighbor_table(size)
+    _last_table = table
+    return table
@@ -0,0 +1,96 @@
+from itertools import combinations
+from game_emulation import Game_grid, State
+
+
+class Board_snapshot:
+    """
+    What a solver may know about a game, small enough to send to worker processes.
+
+    Bombs are never included, and numbers only for revealed cells, so a worker can't see more
+    than the solver that sent it.
+    """
+    def __init__(self, size, bombs, covered, flagged, numbers) -> None:
+        self.size = size
+        self.bombs = bombs
+        self.covered = covered
+        self.flagged = flagged
+        self.numbers = numbers
+
+    @classmethod
+    def from_game_grid(cls, game_grid) -> "Board_snapshot":
+        numbers = bytes(0 if cov else num for cov, num in zip(game_grid.covered, game_grid.adjacent_bombs))
+        return cls(game_grid.size, game_grid.bombs, bytes(game_grid.covered), bytes(game_grid.flagged), numbers)
+
+    def key(self):
+        return (self.size, self.bombs, self.covered, self.flagged, self.numbers)
+
+    def to_game_grid(self) -> Game_grid:
+        game_grid = Game_grid(self.size, self.bombs)
+        game_grid.covered[:] = self.covered
+        game_grid.flagged[:] = self.flagged
+        game_grid.adjacent_bombs[:] = self.numbers
+        game_grid.game_started = True
+        return game_grid
+
+
+# the last snapshot's solver in this worker process, reused while tasks keep coming for the same board
+_worker_solver = None
+_worker_key = None
+
+
+"""
+Run the simulations of a chunk of flag combinations around one source tile, in a worker process.
+
+Returns (actions, num_combinations, num_unsat): actions is the frozenset of actions common to every
+satisfiable combination in the chunk, or None if none of them was satisfiable.
+"""
+def guaranteed_actions_chunk(snapshot:Board_snapshot, solver_class, source_tile, chunk):
+    global _worker_solver, _worker_key
+    key = (snapshot.key(), solver_class)
+    if key != _worker_key:
+        _worker_solver = solver_class(snapshot.to_game_grid())
+        _worker_key = key
+    solver = _worker_solver
+    common = None
+    num_unsat = 0
+    for combination in chunk:
+        actions = solver.run_simulation(solver.tiles, combination)
+        if actions == "unsat":
+            num_unsat += 1
+            continue
+        common = frozenset(actions) if common is None else common & frozenset(actions)
+    return common, len(chunk), num_unsat
+
+
+"""
+Find the guaranteed actions of several source tiles at once on a process pool.
+
+Every tile's flag combinations are split into chunks of chunk_size, and each chunk's common actions
+are intersected back together here, which gives the same result as Solver.find_guaranteed_actions.
+Returns {tile: list of (action, cell)}, plus (num_combinations, num_unsat) over every tile.
+"""
+def find_guaranteed_actions_parallel(solver, solver_grid, tiles, pool, chunk_size=8):
+    snapshot = Board_snapshot.from_game_grid(solver.game_grid)
+    futures = {}
+    for tile in tiles:
+        covered_tiles = solver.neighbors_of_state(solver_grid, tile, State.COVERED)
+        num_unflagged = solver.adjacent_bombs[tile] - solver.flagged_counts[tile]
+        all_combinations = list(combinations(covered_tiles, num_unflagged))
+        futures[tile] = [
+            pool.submit(guaranteed_actions_chunk, snapshot, type(solver), tile, all_combinations[first:first + chunk_size])
+            for first in range(0, len(all_combinations), chunk_size)
+        ]
+
+    results = {}
+    num_combinations = 0
+    num_unsat = 0
+    for tile, tile_futures in futures.items():
+        common = None
+        for future in tile_futures:
+            actions, chunk_combinations, chunk_unsat = future.result()
+            num_combinations += chunk_combinations
+            num_unsat += chunk_unsat
+            if actions is None: continue
+            common = actions if common is None else common & actions
+        results[tile] = list(common) if common else []
+    return results, (num_combinations, num_unsat)
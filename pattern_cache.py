@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from frontier_components import Component, Constraint, Enumeration, split_components, enumerate_component
+
+# the eight rotations and reflections of the board
+SYMMETRIES = (
+    lambda row, col: (row, col),
+    lambda row, col: (col, row),
+    lambda row, col: (row, -col),
+    lambda row, col: (-row, col),
+    lambda row, col: (-row, -col),
+    lambda row, col: (col, -row),
+    lambda row, col: (-col, row),
+    lambda row, col: (-col, -row),
+)
+
+
+"""
+Encode a component independently of where it sits on the board and which way round it is.
+
+Each symmetry maps the component's cells to (row, col) pairs shifted so the smallest row and column
+are 0, and the smallest resulting encoding of the constraints is the key.
+Returns (key, cell_of) where cell_of maps each canonical (row, col) back to the board's cell id.
+"""
+def canonical_key(component:Component, size):
+    best_key = None
+    best_cell_of = None
+    for symmetry in SYMMETRIES:
+        moved = {cell: symmetry(*divmod(cell, size)) for cell in component.cells}
+        min_row = min(row for row, _ in moved.values())
+        min_col = min(col for _, col in moved.values())
+        moved = {cell: (row - min_row, col - min_col) for cell, (row, col) in moved.items()}
+        key = tuple(sorted(
+            (tuple(sorted(moved[cell] for cell in constraint.cells)), constraint.mines)
+            for constraint in component.constraints
+        ))
+        if best_key is None or key < best_key:
+            best_key = key
+            best_cell_of = {position: cell for cell, position in moved.items()}
+    return best_key, best_cell_of
+
+
+class Pattern_cache:
+    """
+    Bounded LRU cache of component enumerations, keyed by canonical_key.
+
+    Entries are stored in canonical coordinates, so the same local pattern anywhere on any board,
+    in any orientation, is enumerated once. One cache can be shared by every game in a process.
+    """
+    def __init__(self, max_entries=20000) -> None:
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    """
+    Enumerate a component through the cache.
+
+    An enumeration cut short by the budget is not cached.
+    Returns an Enumeration over the component's board cells, or None if the budget ran out first.
+    """
+    def enumerate(self, component:Component, size, budget=None) -> Enumeration:
+        key, cell_of = canonical_key(component, size)
+        canonical = self.get(key)
+        if canonical is None:
+            canonical_component = split_components([Constraint(None, cells, mines) for cells, mines in key])[0]
+            canonical = enumerate_component(canonical_component, budget)
+            if canonical is None: return None
+            self.put(key, canonical)
+        return Enumeration(
+            [cell_of[position] for position in canonical.cells],
+            canonical.solutions_by_mines,
+            canonical.mine_counts_by_mines,
+        )
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# shared by every solver in the process unless one is given its own cache
+shared_cache = Pattern_cache()
@@ -0,0 +1,173 @@
+import ast, mmap, os, struct, sys
+from array import array
+
+# Binary log of board positions and game traces.
+#
+# A log file starts with FILE_HEADER (magic, version) and is followed by records, each one:
+#     RECORD_HEADER   body length, board size, bomb count, last tile row/col (-1 if none), move count
+#     covered         one bit per cell, cell 0 in the lowest bit, padded to a whole byte
+#     has_bomb        same layout
+#     flagged         same layout
+#     moves           one little-endian uint32 per move: cell << 2 | action
+# Adjacent bomb counts are not stored, they follow from the bombs.
+# Records are only ever appended, so many games can be streamed into one file and read back
+# through a memory map without loading the whole file.
+
+MAGIC = b"MSPL"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sHH")
+RECORD_HEADER = struct.Struct("<IHIhhI")
+# where the solver appends positions it got wrong
+FAILURE_LOG = os.path.join("logs", "failures.mslog")
+
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def pack_bits(cells) -> bytes:
+    num_bytes = (len(cells) + 7) // 8
+    if not cells: return b""
+    # reversed so that cell 0 becomes the lowest bit
+    return int(bytes(cells).translate(_TO_DIGITS)[::-1], 2).to_bytes(num_bytes, "little")
+
+
+def unpack_bits(data, num_cells) -> bytearray:
+    if not num_cells: return bytearray()
+    digits = format(int.from_bytes(data, "little"), "0%db" % num_cells)
+    return bytearray(digits.encode()[::-1].translate(_FROM_DIGITS))
+
+
+class Position:
+    def __init__(self, size, bombs, covered, has_bomb, flagged, last_tile=None, moves=()) -> None:
+        self.size = size
+        self.bombs = bombs
+        # one byte per cell id, like Game_grid
+        self.covered = covered
+        self.has_bomb = has_bomb
+        self.flagged = flagged
+        # (row, col) the solver was working from when the position was saved, or None
+        self.last_tile = last_tile
+        # (action, cell) pairs played from this position, action being a State value
+        self.moves = list(moves)
+
+    @classmethod
+    def from_game_grid(cls, game_grid, last_tile=None, moves=()) -> "Position":
+        return cls(game_grid.size, game_grid.bombs, bytearray(game_grid.covered), bytearray(game_grid.has_bomb),
+                   bytearray(game_grid.flagged), last_tile, moves)
+
+    def to_bytes(self) -> bytes:
+        last_row, last_col = self.last_tile if self.last_tile is not None else (-1, -1)
+        moves = array("I", (cell << 2 | int(action) for action, cell in self.moves))
+        if sys.byteorder != "little": moves.byteswap()
+        body = b"".join((pack_bits(self.covered), pack_bits(self.has_bomb), pack_bits(self.flagged), moves.tobytes()))
+        header = RECORD_HEADER.pack(RECORD_HEADER.size - 4 + len(body), self.size, self.bombs, last_row, last_col, len(moves))
+        return header + body
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0) -> "Position":
+        _, size, bombs, last_row, last_col, num_moves = RECORD_HEADER.unpack_from(buffer, offset)
+        num_cells = size * size
+        num_bytes = (num_cells + 7) // 8
+        start = offset + RECORD_HEADER.size
+        covered = unpack_bits(buffer[start:start + num_bytes], num_cells)
+        has_bomb = unpack_bits(buffer[start + num_bytes:start + 2 * num_bytes], num_cells)
+        flagged = unpack_bits(buffer[start + 2 * num_bytes:start + 3 * num_bytes], num_cells)
+        moves = array("I")
+        moves.frombytes(buffer[start + 3 * num_bytes:start + 3 * num_bytes + 4 * num_moves])
+        if sys.byteorder != "little": moves.byteswap()
+        last_tile = (last_row, last_col) if last_row >= 0 else None
+        return cls(size, bombs, covered, has_bomb, flagged, last_tile, [(move & 3, move >> 2) for move in moves])
+
+
+class Position_log_writer:
+    """Appends positions to a log file, writing the file header first if the file is new."""
+    def __init__(self, path) -> None:
+        directory = os.path.dirname(path)
+        if directory: os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(MAGIC, VERSION, 0))
+
+    def write(self, position:Position):
+        self.file.write(position.to_bytes())
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Position_log:
+    """
+    Reads a position log through a memory map.
+
+    Iterating streams the records in order. Indexing finds record offsets by hopping from one
+    record header to the next the first time it is needed, without decoding any boards.
+    """
+    def __init__(self, path) -> None:
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _ = FILE_HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a position log")
+        if version != VERSION:
+            raise ValueError(f"{path} is position log version {version}, this reader only knows version {VERSION}")
+        self.offsets = None
+
+    def record_offsets(self):
+        offset = FILE_HEADER.size
+        end = len(self.map)
+        while offset < end:
+            yield offset
+            offset += 4 + struct.unpack_from("<I", self.map, offset)[0]
+
+    def index(self):
+        if self.offsets is None:
+            self.offsets = array("Q", self.record_offsets())
+        return self.offsets
+
+    def __len__(self):
+        return len(self.index())
+
+    def __getitem__(self, i) -> Position:
+        return Position.from_buffer(self.map, self.index()[i])
+
+    def __iter__(self):
+        for offset in self.record_offsets():
+            yield Position.from_buffer(self.map, offset)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+"""
+Read a position from the old logs/NNN.txt format (size, bomb count, last tile and Game_grid.dump()
+on four lines) with ast.literal_eval instead of eval.
+
+Returns a Position.
+"""
+def load_legacy_log(path) -> Position:
+    with open(path, "r") as f:
+        size = int(f.readline())
+        bombs = int(f.readline())
+        last_tile = ast.literal_eval(f.readline())
+        dump = ast.literal_eval(f.readline())
+    cells = [cell for row in dump for cell in row]
+    return Position(
+        size, bombs,
+        bytearray(bool(cov) for cov, _, _, _ in cells),
+        bytearray(bool(bomb) for _, bomb, _, _ in cells),
+        bytearray(bool(flag) for _, _, _, flag in cells),
+        tuple(last_tile),
+    )
@@ -0,0 +1,127 @@
+import argparse, glob, json, os, sys, time
+from game_emulation import Game_grid, State
+from minesweeper_solver import Solver
+from pattern_cache import Pattern_cache
+from position_log import Position, Position_log, load_legacy_log
+
+BASELINE_FILE = os.path.join("logs", "baseline.json")
+
+
+class Position_result:
+    def __init__(self, name, solve_time, num_actions, wrong_actions) -> None:
+        self.name = name
+        self.solve_time = solve_time
+        self.num_actions = num_actions
+        # (action, cell) pairs the solver played as certain that contradict the hidden board
+        self.wrong_actions = wrong_actions
+
+
+"""
+Load every position in the corpus directory: each record of every *.mslog file, and the old
+NNN.txt files.
+
+Yields (name, Position), name being "file:record" or the file name.
+"""
+def load_corpus(directory):
+    for path in sorted(glob.glob(os.path.join(directory, "*.mslog"))):
+        with Position_log(path) as log:
+            for i, position in enumerate(log):
+                yield f"{os.path.basename(path)}:{i}", position
+    for path in sorted(glob.glob(os.path.join(directory, "*.txt"))):
+        yield os.path.basename(path), load_legacy_log(path)
+
+
+"""
+Replay one position headlessly: the saved last_tile first, then every certain tier until the solver
+runs out of certain moves. The solver never guesses here, so every action it plays is one it claims
+is certain, and any action that reveals a bomb or flags a safe tile is wrong.
+Each replay starts from an empty pattern cache, so repeats and earlier positions don't make it faster
+than the run its baseline came from.
+
+Returns (seconds, number of actions, wrong actions).
+"""
+def replay(position:Position):
+    game_grid = Game_grid(position.size, position.bombs, load=position)
+    start = time.perf_counter()
+    solver = Solver(game_grid, pattern_cache=Pattern_cache())
+    if position.last_tile is not None:
+        source_tile = game_grid.index(*position.last_tile)
+        actions = solver.find_guaranteed_actions(solver.tiles, source_tile)
+        solver.take_actions(game_grid, actions)
+    if not game_grid.lost():
+        solver.launch(game_grid, guess=False)
+    solve_time = time.perf_counter() - start
+    wrong_actions = [
+        (action, game_grid.index(row, col)) for action, row, col in solver.actions
+        if (action == State.REVEALED) == bool(game_grid.has_bomb[game_grid.index(row, col)])
+    ]
+    return solve_time, len(solver.actions), wrong_actions
+
+
+"""
+Replay a position `repeats` times and keep the fastest time, which is the least noisy.
+
+Returns a Position_result.
+"""
+def run_position(name, position:Position, repeats=3) -> Position_result:
+    best_time = None
+    for _ in range(repeats):
+        solve_time, num_actions, wrong_actions = replay(position)
+        if best_time is None or solve_time < best_time: best_time = solve_time
+    return Position_result(name, best_time, num_actions, wrong_actions)
+
+
+"""
+Compare a position's time against its baseline.
+A position is slower only when it is both `tolerance` times and `min_slowdown` seconds over the
+baseline, so tiny positions don't fail on timer noise.
+"""
+def is_regression(solve_time, baseline_time, tolerance, min_slowdown) -> bool:
+    if baseline_time is None: return False
+    return solve_time > baseline_time * tolerance and solve_time - baseline_time > min_slowdown
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the saved positions under logs/ and fail on wrong certain moves or slowdowns.")
+    parser.add_argument("--logs", default="logs", help="directory holding the position logs")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="json file of baseline seconds per position")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run's timings as the new baseline")
+    parser.add_argument("--repeats", type=int, default=3, help="replays per position, the fastest is kept")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="slowdown factor over the baseline that fails the run")
+    parser.add_argument("--min-slowdown", type=float, default=0.005, help="seconds over the baseline that fails the run")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    results = []
+    wrong = 0
+    slower = 0
+    for name, position in load_corpus(args.logs):
+        result = run_position(name, position, args.repeats)
+        results.append(result)
+        baseline_time = baseline.get(name)
+        status = "ok"
+        if result.wrong_actions:
+            status = f"WRONG {[(State(action).name, cell) for action, cell in result.wrong_actions]}"
+            wrong += 1
+        elif is_regression(result.solve_time, baseline_time, args.tolerance, args.min_slowdown):
+            status = "SLOWER"
+            slower += 1
+        compared = f" (baseline {baseline_time * 1000:.2f} ms)" if baseline_time is not None else ""
+        print(f"{name:<24} {position.size}x{position.bombs:<4} {result.num_actions:>4} actions "
+              f"{result.solve_time * 1000:9.2f} ms{compared}   {status}")
+
+    print(f"{len(results)} positions, {wrong} with wrong certain moves, {slower} slower than baseline")
+    if args.update_baseline:
+        baseline.update({result.name: result.solve_time for result in results})
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+    if wrong or slower:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+import argparse, asyncio, json, math, os, signal, socket, time
+from concurrent.futures import ProcessPoolExecutor
+from game_emulation import Game_grid, State
+from minesweeper_solver import Solver
+from neighbor_table import neighbor_table
+from parallel_search import Board_snapshot
+from solver_budget import Solver_budget
+from solver_metrics import Solver_metrics
+
+# The service speaks newline-delimited JSON, over a Unix socket by default or localhost TCP with --port.
+# Each request is one JSON object on one line:
+#   {"id": 1, "board": <Game_grid.dump()>, "bombs": 140}
+#   {"id": 2, "cells": "##1F0...", "bombs": 140, "mode": "probabilities", "seconds": 0.05}
+# "cells" is the compact encoding, one character per cell in row-major order: "#" covered, "F" flagged,
+# "0"-"8" a revealed number. bombs defaults to the bombs in a dump, and is required with cells.
+# mode is "hint" (default) or "probabilities", and seconds/nodes set a Solver_budget for the request.
+# A request can be sent before the answer to the last one arrives; answers echo the id and may come back
+# in any order. {"stats": true} returns the queue depth, latencies and counters.
+SOCKET_PATH = "/tmp/minesweeper-solver.sock"
+COVERED_CHAR = "#"
+FLAGGED_CHAR = "F"
+# board sizes whose neighbor tables the workers build before the first request
+WARM_SIZES = (9, 16, 18, 25, 30)
+# timings kept per name for the stats, oldest dropped first
+MAX_TIMINGS = 10000
+
+
+def encode_cells(game_grid) -> str:
+    return "".join(
+        FLAGGED_CHAR if flag else COVERED_CHAR if cov else str(num)
+        for cov, flag, num in zip(game_grid.covered, game_grid.flagged, game_grid.adjacent_bombs)
+    )
+
+
+"""
+Build the Board_snapshot a request describes, from either a dump or the compact encoding.
+The bombs of a dump only count towards the total; the solver never sees where they are.
+Raises ValueError when the request has no board or the board is malformed.
+"""
+def snapshot_from_request(request) -> Board_snapshot:
+    if "board" in request:
+        board = request["board"]
+        bombs = request.get("bombs", sum(bool(bomb) for row in board for _, bomb, _, _ in row))
+        if any(len(row) != len(board) for row in board): raise ValueError("board is not square")
+        return Board_snapshot.from_game_grid(Game_grid(len(board), bombs, load=board))
+    if "cells" in request:
+        cells = request["cells"]
+        size = request.get("size", math.isqrt(len(cells)))
+        if size * size != len(cells): raise ValueError("cells does not hold size x size characters")
+        if "bombs" not in request: raise ValueError("bombs is required with cells")
+        if not set(cells) <= set(COVERED_CHAR + FLAGGED_CHAR + "012345678"): raise ValueError("unknown character in cells")
+        # flagged cells are covered too, as in Game_grid
+        covered = bytes(char in (COVERED_CHAR, FLAGGED_CHAR) for char in cells)
+        flagged = bytes(char == FLAGGED_CHAR for char in cells)
+        numbers = bytes(int(char) if char.isdigit() else 0 for char in cells)
+        return Board_snapshot(size, request["bombs"], covered, flagged, numbers)
+    raise ValueError("request has no board or cells")
+
+
+# the warmed neighbor tables, held for the life of the worker so they aren't dropped between requests
+_warm_tables = []
+
+
+def warm_worker(sizes):
+    _warm_tables.extend(neighbor_table(size) for size in sizes)
+
+
+"""
+Answer one request in a worker process.
+Its solver uses the process-wide pattern cache, which stays warm for as long as the worker lives.
+"""
+def solve_request(snapshot:Board_snapshot, mode, seconds, nodes):
+    solver = Solver(snapshot.to_game_grid())
+    budget = Solver_budget(seconds, nodes) if seconds is not None or nodes is not None else None
+    size = snapshot.size
+    if mode == "probabilities":
+        solver.budget = budget
+        probabilities = solver.find_mine_probabilities(solver.tiles)
+        if probabilities is None: return {"complete": False}
+        return {
+            "complete": True,
+            "probabilities": [[*divmod(cell, size), p] for cell, p in sorted(probabilities.probabilities.items())],
+            "safe": [divmod(cell, size) for cell in sorted(probabilities.safe_cells)],
+            "mines": [divmod(cell, size) for cell in sorted(probabilities.mine_cells)],
+        }
+    hint = solver.hint(budget)
+    return {
+        "tier": hint.tier,
+        "complete": hint.complete,
+        "actions": [[State(action).name, *divmod(cell, size)] for action, cell in hint.actions],
+    }
+
+
+"""
+Answer a batch of requests in a worker process, one answer per request in the same order.
+A request that fails gets an error answer instead of failing the batch.
+"""
+def solve_batch(batch):
+    answers = []
+    for request in batch:
+        try:
+            answers.append(solve_request(*request))
+        except Exception as error:
+            answers.append({"error": f"{type(error).__name__}: {error}"})
+    return answers
+
+
+class Solve_service:
+    """
+    Answers solver requests from many clients on a pool of long-lived worker processes.
+
+    Requests wait in one queue. Whenever a worker is free, everything queued (up to max_batch) goes to it
+    as a single task, so under load one pickle and one round trip to the pool is shared by many boards,
+    and when idle a request is sent on its own after waiting at most batch_window seconds.
+    """
+    def __init__(self, workers=1, max_batch=32, batch_window=0.002) -> None:
+        self.workers = workers
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=warm_worker, initargs=(WARM_SIZES,))
+        self.queue = asyncio.Queue()
+        # one per worker, taken while a batch is on it
+        self.free_workers = asyncio.Semaphore(workers)
+        self.in_flight = 0
+        self.metrics = Solver_metrics()
+        self.batcher = None
+
+    def record_time(self, name, seconds):
+        self.metrics.add_time(name, seconds)
+        times = self.metrics.timings[name]
+        if len(times) > 2 * MAX_TIMINGS: del times[:-MAX_TIMINGS]
+
+    def stats(self):
+        return {"queue_depth": self.queue.qsize(), "in_flight": self.in_flight, "workers": self.workers,
+                **self.metrics.report()}
+
+    async def submit(self, request):
+        if request.get("stats"): return self.stats()
+        self.metrics.count("requests")
+        try:
+            snapshot = snapshot_from_request(request)
+        except (ValueError, TypeError, KeyError) as error:
+            self.metrics.count("errors")
+            return {"error": f"bad request: {error}"}
+        mode = request.get("mode", "hint")
+        if mode not in ("hint", "probabilities"):
+            self.metrics.count("errors")
+            return {"error": f"bad request: unknown mode {mode!r}"}
+        answer = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait(((snapshot, mode, request.get("seconds"), request.get("nodes")), answer, time.perf_counter()))
+        return await answer
+
+    async def collect_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.free_workers.acquire()
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0: break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            loop.create_task(self.run_batch(batch))
+
+    async def run_batch(self, batch):
+        self.in_flight += 1
+        self.metrics.count("batches")
+        self.metrics.count("batched_requests", len(batch))
+        start = time.perf_counter()
+        try:
+            answers = await asyncio.get_running_loop().run_in_executor(self.pool, solve_batch, [request for request, _, _ in batch])
+        except Exception as error:
+            answers = [{"error": f"{type(error).__name__}: {error}"}] * len(batch)
+        finally:
+            self.in_flight -= 1
+            self.free_workers.release()
+        end = time.perf_counter()
+        self.record_time("batch", end - start)
+        for (_, answer, queued), result in zip(batch, answers):
+            self.record_time("queue_wait", start - queued)
+            self.record_time("latency", end - queued)
+            if "error" in result: self.metrics.count("errors")
+            if not answer.done(): answer.set_result(result)
+
+    async def handle_client(self, reader, writer):
+        pending = set()
+
+        async def answer(line):
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict): raise ValueError("request is not a JSON object")
+            except ValueError as error:
+                result = {"error": f"bad request: {error}"}
+            else:
+                result = await self.submit(request)
+                if "id" in request: result = {"id": request["id"], **result}
+            writer.write(json.dumps(result).encode() + b"\n")
+            await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if not line.strip(): continue
+                task = asyncio.create_task(answer(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending: await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, path=SOCKET_PATH, port=None):
+        self.batcher = asyncio.create_task(self.collect_batches())
+        # large boards as dumps are long lines
+        limit = 1 << 24
+        if port is not None:
+            server = await asyncio.start_server(self.handle_client, "127.0.0.1", port, limit=limit)
+        else:
+            if os.path.exists(path): os.remove(path)
+            server = await asyncio.start_unix_server(self.handle_client, path, limit=limit)
+        # stop like on Ctrl-C, so the workers are shut down and the socket removed
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.batcher.cancel()
+            self.pool.shutdown(cancel_futures=True)
+            if port is None and os.path.exists(path): os.remove(path)
+
+
+class Solve_client:
+    """
+    Blocking client for a running Solve_service, keeping one connection open across requests.
+    Nothing is solved in the client's process, so a query costs a round trip rather than a solver setup.
+    """
+    def __init__(self, path=SOCKET_PATH, port=None) -> None:
+        if port is not None:
+            self.connection = socket.create_connection(("127.0.0.1", port))
+        else:
+            self.connection = socket.socket(socket.AF_UNIX)
+            self.connection.connect(path)
+        self.lines = self.connection.makefile("rb")
+
+    def request(self, message):
+        self.connection.sendall(json.dumps(message).encode() + b"\n")
+        return json.loads(self.lines.readline())
+
+    def hint(self, game_grid, **options):
+        return self.request({"cells": encode_cells(game_grid), "bombs": game_grid.bombs, **options})
+
+    def stats(self):
+        return self.request({"stats": True})
+
+    def close(self):
+        self.lines.close()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve solver hints and mine probabilities to local clients.")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Unix socket to listen on")
+    parser.add_argument("--port", type=int, help="listen on this localhost TCP port instead of a Unix socket")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes; 0 uses every core")
+    parser.add_argument("--max-batch", type=int, default=32, help="most requests sent to a worker as one task")
+    parser.add_argument("--batch-window", type=float, default=0.002, help="seconds to wait for more requests before sending a batch")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    service = Solve_service(workers, args.max_batch, args.batch_window)
+    print(f"serving on {f'127.0.0.1:{args.port}' if args.port is not None else args.socket} with {workers} workers")
+    try:
+        asyncio.run(service.serve(args.socket, args.port))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
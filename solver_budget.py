@@ -0,0 +1,42 @@
+import time
+
+# the solver's tiers from cheapest to deepest, the order they are tried in
+TIERS = ("determinism", "subset", "components", "guaranteed_actions", "probability", "guess")
+
+
+class Solver_budget:
+    """
+    A limit on how long a solver may work: a number of seconds from creation, a number of nodes, or both.
+
+    A node is one flag simulation or one component enumeration. The budget is checked before every node,
+    and every so often inside a component enumeration, which can be long on its own. When it runs out,
+    the solver stops and keeps only results that are still certain.
+    """
+    def __init__(self, seconds=None, nodes=None) -> None:
+        self.deadline = time.perf_counter() + seconds if seconds is not None else None
+        self.max_nodes = nodes
+        self.nodes = 0
+        # set by cancel, from any thread
+        self.cancelled = False
+
+    def spend(self, nodes=1):
+        self.nodes += nodes
+
+    """Run out now, whatever is left. The solver notices at its next budget check."""
+    def cancel(self):
+        self.cancelled = True
+
+    def exhausted(self) -> bool:
+        if self.cancelled: return True
+        if self.max_nodes is not None and self.nodes >= self.max_nodes: return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+
+class Hint:
+    def __init__(self, actions, tier, complete) -> None:
+        # (action, cell) pairs, certain unless tier is "guess" or "quick_guess"
+        self.actions = actions
+        # the tier the actions came from
+        self.tier = tier
+        # False if the budget ran out before the solver could look through every tier it needed
+        self.complete = complete
@@ -0,0 +1,125 @@
+from functools import lru_cache
+import pygame
+import sprite_cache
+from game_emulation import State
+from grid_renderer import changed_cells
+from minesweeper_solver import Solver_observer
+
+
+"""Render the debug mark of each solver state, once per process."""
+@lru_cache(maxsize=1)
+def render_marks():
+    font = sprite_cache.font(20)
+    return {
+        State.COVERED: font.render(".", True, (100, 0, 0)),
+        State.FLAGGED: font.render("f", True, (100, 0, 0)),
+        State.REVEALED: font.render("r", True, (0, 100, 0)),
+    }
+
+
+class Pygame_observer(Solver_observer):
+    """Draws the solver's overlays on top of the game grid and paces them for a human to follow."""
+    class Overlay:
+        def __init__(self, row, col, color, delay = 0) -> None:
+            self.row = row
+            self.col = col
+            self.color = color
+            self.delay = delay
+
+    def __init__(self, game_grid, screen, debug=False, recorder=None) -> None:
+        self.game_grid = game_grid
+        self.screen = screen
+        # Frame_recorder that gets every frame shown, if recording
+        self.recorder = recorder
+        self.overlays = []
+        self.debug = debug
+        # cells with an overlay or debug mark drawn over them, redrawn on the next draw
+        self.covered_cells = []
+        # the solver grid the debug marks were last drawn from
+        self.marked = None
+        self.marks = render_marks()
+
+    def push_overlay(self, row, col, color, delay=0):
+        self.overlays.append(self.Overlay(row, col, color, delay))
+
+    def pop_overlay(self):
+        self.overlays.pop()
+
+    def push_and_render_overlay(self, solver_grid, row, col, color, delay):
+        self.overlays.append(self.Overlay(row, col, color))
+        self.render(solver_grid, delay)
+
+    def clear_overlays(self):
+        self.overlays = []
+
+    def log(self, message):
+        print(message)
+
+    """
+    Draw the cells that changed, then the overlays and debug marks on top.
+    Cells drawn over last time are redrawn first, so removed overlays disappear.
+    Returns the rectangles that changed.
+    """
+    def draw(self, solver_grid=None):
+        renderer = self.game_grid.renderer
+        if renderer is not None and renderer.screen is self.screen:
+            renderer.invalidate(self.covered_cells)
+            if self.debug and solver_grid is not None:
+                # a mark is drawn over its tile, so a changed mark needs the tile under it redrawn
+                if self.marked is None: renderer.invalidate()
+                else: renderer.invalidate(changed_cells(self.marked, solver_grid))
+        rects = self.game_grid.draw(self.screen)
+        renderer = self.game_grid.renderer
+        dsize = self.game_grid.tile_draw_size
+        size = self.game_grid.size
+
+        if self.debug and solver_grid is not None:
+            for cell in renderer.redrawn:
+                row, col = divmod(cell, size)
+                self.screen.blit(self.marks[solver_grid[cell]], (col * dsize, row * dsize))
+            self.marked = bytes(solver_grid)
+
+        self.covered_cells = []
+        for overlay in self.overlays:
+            offset = 2
+            rect = (overlay.col * dsize + offset, overlay.row * dsize + offset, dsize - offset * 2, dsize - offset * 2)
+            rects.append(pygame.draw.rect(self.screen, overlay.color, rect, width=2))
+            self.covered_cells.append(overlay.row * size + overlay.col)
+            if overlay.delay:
+                self.update_display(rects)
+                pygame.time.wait(overlay.delay)
+        return rects
+
+    """
+    Take the overlays and debug marks off the board once the solver is done drawing.
+    The cells under them are only marked for a redraw; the game loop's next draw repaints them.
+    """
+    def erase(self):
+        self.clear_overlays()
+        renderer = self.game_grid.renderer
+        if renderer is not None and renderer.screen is self.screen:
+            # debug marks can be on any cell
+            if self.marked is not None: renderer.invalidate()
+            else: renderer.invalidate(self.covered_cells)
+        self.covered_cells = []
+        self.marked = None
+
+    def update_display(self, rects):
+        pygame.display.update(rects)
+        if self.recorder is not None: self.recorder.capture(self.screen)
+
+    def render(self, solver_grid, wait_time=0, wait_for_click=False):
+        self.update_display(self.draw(solver_grid))
+        pygame.time.wait(wait_time)
+        while(wait_for_click): 
+            for event in pygame.event.get(): 
+                if event.type == pygame.KEYDOWN: wait_for_click = False
+    
+    def wait_for_input(self, solver_grid, clear_overlays = False):
+        waiting = True
+        self.render(solver_grid)
+        while (waiting):
+            for event in pygame.event.get():
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_g:
+                    waiting = False
+                    if clear_overlays: self.clear_overlays()
@@ -0,0 +1,58 @@
+import json
+
+
+def percentile(values, fraction):
+    if not values: return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return ordered[index]
+
+
+class Solver_metrics:
+    """
+    Timings and counters recorded by a Solver.
+
+    Solvers only record into a Solver_metrics when they are given one, so metrics cost a
+    single None check when they are off. One instance can collect a single game or be
+    merged across a whole batch.
+    """
+    def __init__(self) -> None:
+        # name -> list of seconds, one entry per call
+        self.timings = {}
+        # name -> count
+        self.counters = {}
+
+    def add_time(self, name, seconds):
+        times = self.timings.get(name)
+        if times is None: self.timings[name] = [seconds]
+        else: times.append(seconds)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, other:"Solver_metrics"):
+        for name, times in other.timings.items():
+            self.timings.setdefault(name, []).extend(times)
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+
+    def report(self):
+        return {
+            "timings": {
+                name: {
+                    "calls": len(times),
+                    "total": sum(times),
+                    "p50": percentile(times, 0.50),
+                    "p99": percentile(times, 0.99),
+                    "max": max(times),
+                }
+                for name, times in sorted(self.timings.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def write_json(self, path, extra=None):
+        report = self.report()
+        if extra: report.update(extra)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
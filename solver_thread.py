@@ -0,0 +1,69 @@
+import queue, threading
+from game_emulation import Game_grid, State
+from minesweeper_solver import Solver
+from position_log import Position
+from solver_budget import Solver_budget
+
+
+class Solver_thread:
+    """
+    Runs Solver.launch on a worker thread so a display can animate the game at its own pace.
+
+    The solver plays on its own copy of the board and puts every action it takes on a queue as
+    (source, action, row, col). The display calls apply_events each frame to play some of them on
+    the real Game_grid, so solving never waits for animation delays and the window stays responsive.
+    """
+    def __init__(self, game_grid:Game_grid, guess=True, metrics=None) -> None:
+        # start the real game first, so that the copy has the same bombs
+        if not game_grid.game_started:
+            game_grid.uncover_tile(game_grid.size // 2, game_grid.size // 2)
+        self.guess = guess
+        self.events = queue.Queue()
+        self.board = Game_grid(game_grid.size, game_grid.bombs, load=Position.from_game_grid(game_grid))
+        self.solver = Solver(self.board, metrics=metrics, action_queue=self.events)
+        # unlimited, only there so that stop() can cancel it
+        self.budget = Solver_budget()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        # set once the solver has stopped and every one of its events was applied
+        self.finished = False
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        try:
+            self.solver.launch(self.board, guess=self.guess, budget=self.budget)
+        finally:
+            # tells apply_events the solver is done
+            self.events.put(None)
+
+    """
+    Make the solver stop at its next budget check and drop the events it hasn't played yet.
+    Waits up to timeout seconds for the thread to end.
+    """
+    def stop(self, timeout=1.0):
+        self.budget.cancel()
+        self.finished = True
+        if self.thread.is_alive(): self.thread.join(timeout)
+
+    """
+    Play up to max_events queued actions on game_grid, without waiting for more.
+
+    Returns the list of (source, action, row, col) events applied.
+    """
+    def apply_events(self, game_grid:Game_grid, max_events=None) -> list:
+        applied = []
+        while not self.finished and (max_events is None or len(applied) < max_events):
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event is None:
+                self.finished = True
+                break
+            _, action, row, col = event
+            if action == State.FLAGGED: game_grid.flag_tile(row, col, True)
+            elif action == State.REVEALED: game_grid.uncover_tile(row, col)
+            applied.append(event)
+        return applied
@@ -0,0 +1,20 @@
+import os
+from functools import lru_cache
+import pygame
+
+# Fonts and sprites, loaded the first time they are asked for and shared by everything in the process
+# that draws. Only the display modules import this, so headless use never imports pygame.
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "img")
+RED_FLAG_SPRITE = "emoji_u1f6a9.svg"
+BOMB_SPRITE = "emoji_u1f4a3.svg"
+
+
+@lru_cache(maxsize=None)
+def font(size) -> pygame.font.Font:
+    if not pygame.font.get_init(): pygame.font.init()
+    return pygame.font.Font(None, size)
+
+
+@lru_cache(maxsize=None)
+def sprite(name, size) -> pygame.Surface:
+    return pygame.transform.scale(pygame.image.load(os.path.join(IMAGE_DIR, name)), size)
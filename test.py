@@ -1,12 +1,20 @@
 import pygame
 from game_emulation import Game_grid
 from minesweeper_solver import Solver 
-
-with open("logs/006.txt", 'r') as f:
-    size = int(f.readline())
-    num_bombs = int(f.readline())
-    last_tile = eval(f.readline())
-    load = eval(f.readline())
+from position_log import FAILURE_LOG, Position_log, load_legacy_log
+import sys
+
+# python test.py [log path] [record number]; old logs/NNN.txt files still load
+path = sys.argv[1] if len(sys.argv) > 1 else FAILURE_LOG
+if path.endswith(".txt"):
+    position = load_legacy_log(path)
+else:
+    with Position_log(path) as log:
+        position = log[int(sys.argv[2]) if len(sys.argv) > 2 else -1]
+size = position.size
+num_bombs = position.bombs
+last_tile = position.last_tile
+load = position
 
 # Set up game
 pygame.init()
@@ -17,17 +25,14 @@ pygame.display.set_caption("minesweeper_test")
 game_grid = Game_grid(size, num_bombs, load=load)
 
 while game_grid is not None:
-    # Fill the background with white
-    screen.fill((255, 255, 255))
-
-    #Draw game grid
-    game_grid.draw(screen)
+    #Draw the tiles that changed, every tile on the first frame
+    changed_rects = game_grid.draw(screen)
 
     # Did the user click the window close button?
     # game_grid = proccess_events(game_grid)
 
-    # Flip the display
-    pygame.display.flip()
+    # Update only the changed part of the display
+    if changed_rects: pygame.display.update(changed_rects)
 
     #Take a screnshot
 